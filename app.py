@@ -1,9 +1,16 @@
-from flask import Flask, render_template, session, current_app, request, flash, redirect, url_for
+from flask import Flask, render_template, session, current_app, request, flash, redirect, url_for, send_from_directory, jsonify
+import hashlib
 import os
+from datetime import datetime, timezone
+from sqlalchemy import func, inspect, text
+from sqlalchemy.orm import joinedload, load_only
 from routes.auth import auth
 from routes.user import user_route
 from routes.project import project, allowed_file, project_bp
 from models import db, Project, User, UserProject
+from images import submit_project_image
+from search import create_search_index, search_project_ids
+from render_cache import render_cache, project_namespace
 from werkzeug.utils import secure_filename
 # Initialize Flask app
 app = Flask(__name__)
@@ -16,10 +23,17 @@ app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///site.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['WTF_CSRF_ENABLED'] = True
 UPLOAD_FOLDER = 'static/uploads'
+VARIANT_FOLDER = os.path.join(UPLOAD_FOLDER, 'variants')
+VARIANT_MAX_AGE = 365 * 24 * 60 * 60
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+BROWSE_PER_PAGE = 24
+BROWSE_MAX_PER_PAGE = 100
+SEARCH_PER_PAGE = 20
+SEARCH_MAX_PER_PAGE = 100
 
 # Add the UPLOAD_FOLDER configuration
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+app.config['VARIANT_FOLDER'] = VARIANT_FOLDER
 
 # Initialize the SQLAlchemy instance
 db.init_app(app)
@@ -39,11 +53,35 @@ app.register_blueprint(project_bp, url_prefix='/project')
 
 
 
+# Columns added after the first release; create_all() does not alter existing tables
+ADDED_COLUMNS = {
+    'project': {
+        'created_at': 'DATETIME',
+        'updated_at': 'DATETIME',
+        'thumbnail_image': 'VARCHAR(255)',
+        'listing_image': 'VARCHAR(255)',
+    },
+}
+
+
+def upgrade_schema():
+    inspector = inspect(db.engine)
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {column['name'] for column in inspector.get_columns(table)}
+        for name, column_type in columns.items():
+            if name not in existing:
+                db.session.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} {column_type}'))
+    db.session.execute(text('CREATE INDEX IF NOT EXISTS ix_project_updated_at ON project (updated_at)'))
+    db.session.commit()
+
+
 # Function to initialize the database
 def init_db(app):
     with app.app_context():
         # Create tables if they don't exist
         db.create_all()
+        upgrade_schema()
+        create_search_index()
 
 
 # Initialize the database
@@ -63,12 +101,158 @@ def contact():
 @app.route('/ivy_league')
 def ivy_league():
     return render_template('ivy_league.html')
+def listing_query():
+    # Only the columns a project card needs, with the organizer joined in the same query
+    return Project.query.options(
+        load_only(
+            Project.id, Project.title, Project.description, Project.organizer_id, Project.fee,
+            Project.place, Project.date, Project.image, Project.thumbnail_image, Project.listing_image,
+            Project.updated_at,
+        ),
+        joinedload(Project.organizer).load_only(User.id, User.username),
+    )
+
+
+def browse_validators(page, per_page):
+    # One aggregate query decides whether the page can have changed since the client last saw it
+    count, max_id, last_modified = db.session.query(
+        func.count(Project.id), func.max(Project.id), func.max(Project.updated_at)
+    ).one()
+    if last_modified is not None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+    # The page shows session-specific navigation, so the validator must differ per visitor
+    key = f"{page}:{per_page}:{count}:{max_id}:{last_modified}:{session.get('user')}:{session.get('role')}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32], last_modified, count
+
+
+def browse_links(page, per_page, total):
+    # Lets clients reach older projects without relying on the template's page links
+    links = []
+    if page * per_page < total:
+        links.append(f'<{url_for("browse_project", page=page + 1, per_page=per_page)}>; rel="next"')
+    if page > 1:
+        links.append(f'<{url_for("browse_project", page=page - 1, per_page=per_page)}>; rel="prev"')
+    return ', '.join(links)
+
+
+def is_not_modified(etag):
+    # Only the ETag decides: Last-Modified misses deletes and edits within the same second, so
+    # If-Modified-Since alone is never answered with 304
+    return bool(request.if_none_match) and request.if_none_match.contains(etag)
+
+
+def with_validators(response, etag, last_modified, links=None):
+    if links:
+        response.headers['Link'] = links
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Cookie')
+    return response
+
+
+def is_anonymous():
+    # Visitors without a login or a pending flash all see the same page, so it can be shared
+    return 'user' not in session and '_flashes' not in session
+
+
+def cached_response(entry):
+    last_modified = None
+    if entry['last_modified'] is not None:
+        last_modified = datetime.fromtimestamp(entry['last_modified'], timezone.utc)
+    if is_not_modified(entry['etag']):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.make_response(entry['html'])
+    return with_validators(response, entry['etag'], last_modified, entry.get('links'))
+
+
+@app.template_global()
+def project_image_url(project, variant='listing'):
+    # Resized copies are used once the background worker has recorded them
+    name = getattr(project, f'{variant}_image', None)
+    if name:
+        return url_for('media', filename=name)
+    return url_for('static', filename=f'uploads/{project.image}')
+
+
+@app.route('/media/<path:filename>')
+def media(filename):
+    # Variant names are content hashes, so a cached copy can never go stale
+    response = send_from_directory(app.config['VARIANT_FOLDER'], filename, max_age=VARIANT_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={VARIANT_MAX_AGE}, immutable'
+    return response
+
+
 @app.route('/browse')
 def browse_project():
-    users = {user.id: user for user in User.query.all()}  # Create a dictionary with user.id as the key
-    projects = Project.query.all()
-
-    return render_template('page2.html', projects=projects, users=users)
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', BROWSE_PER_PAGE, type=int), 1), BROWSE_MAX_PER_PAGE)
+
+    anonymous = is_anonymous()
+    cache_key = render_cache.key('browse', f'{page}:{per_page}')
+    if anonymous:
+        cached = render_cache.get(cache_key)
+        if cached is not None:
+            return cached_response(cached)
+
+    etag, last_modified, total = browse_validators(page, per_page)
+    links = browse_links(page, per_page, total)
+    # Pending flash messages are rendered once, so never answer 304 while one is waiting
+    if '_flashes' not in session and is_not_modified(etag):
+        return with_validators(current_app.response_class(status=304), etag, last_modified, links)
+
+    pagination = (
+        listing_query()
+        .order_by(Project.id.desc())
+        .paginate(page=page, per_page=per_page, error_out=False)
+    )
+    projects = pagination.items
+    users = {project.organizer.id: project.organizer for project in projects}  # Only the organizers on this page
+
+    html = render_template('page2.html', projects=projects, users=users, pagination=pagination)
+    if anonymous:
+        render_cache.set(cache_key, html, etag, last_modified, links)
+    return with_validators(current_app.make_response(html), etag, last_modified, links)
+
+
+@app.route('/search')
+def search_projects():
+    query = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', SEARCH_PER_PAGE, type=int), 1), SEARCH_MAX_PER_PAGE)
+
+    # Fetch one extra id to know whether another page exists without counting every match
+    ids = search_project_ids(
+        query,
+        min_fee=request.args.get('min_fee', type=float),
+        max_fee=request.args.get('max_fee', type=float),
+        date_from=request.args.get('date_from'),
+        date_to=request.args.get('date_to'),
+        limit=per_page + 1,
+        offset=(page - 1) * per_page,
+    )
+    has_more = len(ids) > per_page
+    ids = ids[:per_page]
+    projects = {project.id: project for project in listing_query().filter(Project.id.in_(ids))} if ids else {}
+
+    results = []
+    for project_id in ids:
+        project = projects.get(project_id)
+        if project is None:  # Deleted after the search matched it
+            continue
+        results.append({
+            'id': project.id,
+            'title': project.title,
+            'place': project.place,
+            'fee': project.fee,
+            'date': project.date,
+            'organizer': project.organizer.username,
+            'image': project_image_url(project, 'thumbnail'),
+            'url': url_for('project_details', project_id=project.id),
+        })
+    return jsonify(query=query, page=page, per_page=per_page, has_more=has_more, results=results)
 
 
 @app.route('/upload', methods=['GET', 'POST'])
@@ -110,8 +294,10 @@ def upload():
             try:
                 db.session.add(new_project)
                 db.session.commit()
+                render_cache.invalidate('browse')
+                submit_project_image(current_app._get_current_object(), new_project.id)
                 flash('Project uploaded successfully!', 'success')
-                return redirect(url_for('/browse'))
+                return redirect(url_for('browse_project'))
             except Exception as e:
                 db.session.rollback()
                 flash('An error occurred while uploading the project. Please try again.', 'danger')
@@ -137,8 +323,10 @@ def remove_project(project_id):
         if project:
             # If the project is found, delete it
             print(f"Project {project_id} found and deleting...")
+            affected_project_id = project.project_id
             db.session.delete(project)
             db.session.commit()
+            render_cache.invalidate('browse', project_namespace(affected_project_id))
             flash('Project successfully removed.', 'success')
         else:
             print(f"Project {project_id} not found.")
@@ -156,8 +344,22 @@ def remove_project(project_id):
 
 @app.route('/project/<int:project_id>')
 def project_details(project_id):
+    anonymous = is_anonymous()
+    cache_key = render_cache.key(project_namespace(project_id), 'details')
+    if anonymous:
+        cached = render_cache.get(cache_key)
+        if cached is not None:
+            return cached_response(cached)
+
     project = Project.query.get_or_404(project_id)  # Get the project by ID
-    return render_template('project_details.html', project=project)
+    html = render_template('project_details.html', project=project)
+    if not anonymous:
+        return html
+
+    etag = hashlib.sha256(html.encode('utf-8')).hexdigest()[:32]
+    last_modified = project.updated_at.replace(tzinfo=timezone.utc, microsecond=0) if project.updated_at else None
+    render_cache.set(cache_key, html, etag, last_modified)
+    return with_validators(current_app.make_response(html), etag, last_modified)
 
 
 
@@ -1,11 +1,27 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.models import AuditLog
+from app.schemas import AuditLogResponse, Page
+from app.utils.config import settings
 from app.utils.dependencies import get_db
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
 
-@router.get("/")
-def list_audit_logs(tenant_id: int, db: Session = Depends(get_db)) -> list[AuditLog]:
-    return db.query(AuditLog).filter(AuditLog.tenant_id == tenant_id).order_by(AuditLog.created_at.desc()).all()
+@router.get("/", response_model=Page[AuditLogResponse])
+def list_audit_logs(
+    tenant_id: int,
+    cursor: str | None = None,
+    limit: int = Query(settings.page_size_default, ge=1, le=settings.page_size_max),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    db: Session = Depends(get_db),
+) -> Page[AuditLogResponse]:
+    query = db.query(AuditLog).filter(AuditLog.tenant_id == tenant_id)
+    try:
+        items, next_cursor = paginate(query, AuditLog, cursor, limit, since, until)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return Page[AuditLogResponse](items=items, next_cursor=next_cursor)
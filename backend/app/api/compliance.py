@@ -1,23 +1,63 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.models import ComplianceRun
-from app.schemas import ComplianceRequest, ComplianceResultResponse
-from app.services.audit_service import log_event
-from app.services.compliance_service import evaluate_requirements
+from app.models import ComplianceResult, ComplianceRun
+from app.schemas import ComplianceRequest, ComplianceResultResponse, ComplianceRunResponse
+from app.services.job_service import submit_run
+from app.services.rationale_cache import rationale_cache
 from app.utils.dependencies import get_db
 
 router = APIRouter()
 
 
-@router.post("/run", response_model=list[ComplianceResultResponse])
-def run_compliance(payload: ComplianceRequest, db: Session = Depends(get_db)) -> list[ComplianceResultResponse]:
-    run = ComplianceRun(tenant_id=payload.tenant_id, report_type=payload.report_type, status="running")
+def _run_response(db: Session, run: ComplianceRun) -> ComplianceRunResponse:
+    completed, prompt_tokens = (
+        db.query(func.count(ComplianceResult.id), func.coalesce(func.sum(ComplianceResult.prompt_tokens), 0))
+        .filter(ComplianceResult.run_id == run.id)
+        .one()
+    )
+    return ComplianceRunResponse(
+        id=run.id,
+        tenant_id=run.tenant_id,
+        report_type=run.report_type,
+        status=run.status,
+        requirement_count=run.requirement_count,
+        completed_count=completed,
+        prompt_tokens=prompt_tokens,
+        error=run.error,
+        created_at=run.created_at,
+    )
+
+
+@router.post("/run", response_model=ComplianceRunResponse, status_code=202)
+def run_compliance(payload: ComplianceRequest, db: Session = Depends(get_db)) -> ComplianceRunResponse:
+    run = ComplianceRun(
+        tenant_id=payload.tenant_id,
+        report_type=payload.report_type,
+        status="queued",
+        requirement_count=len(payload.requirements),
+    )
     db.add(run)
     db.commit()
     db.refresh(run)
 
-    results = evaluate_requirements(db, run.id, payload.requirements)
-    run.status = "completed"
-    db.commit()
-    log_event(db, payload.tenant_id, None, "compliance.run", f"Run {run.id} for {payload.report_type}")
-    return results
+    submit_run(run.id, payload.requirements)
+    return _run_response(db, run)
+
+
+@router.get("/runs/{run_id}", response_model=ComplianceRunResponse)
+def get_run(run_id: int, db: Session = Depends(get_db)) -> ComplianceRunResponse:
+    run = db.get(ComplianceRun, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return _run_response(db, run)
+
+
+@router.get("/runs/{run_id}/results", response_model=list[ComplianceResultResponse])
+def get_run_results(run_id: int, db: Session = Depends(get_db)) -> list[ComplianceResultResponse]:
+    return db.query(ComplianceResult).filter(ComplianceResult.run_id == run_id).order_by(ComplianceResult.id).all()
+
+
+@router.get("/cache/stats")
+def cache_stats() -> dict:
+    return rationale_cache.stats()
@@ -1,12 +1,15 @@
+from datetime import datetime
 from pathlib import Path
-from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
 from sqlalchemy.orm import Session
-from app.models import Document, DocumentChunk
-from app.schemas import DocumentResponse
+from app.models import Document
+from app.schemas import DocumentResponse, Page
 from app.services.audit_service import log_event
-from app.services.document_service import extract_paragraphs
+from app.services.document_service import save_stream
+from app.services.ingestion_service import ingest_document
 from app.utils.config import settings
 from app.utils.dependencies import get_db
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
@@ -20,35 +23,37 @@ def upload_document(
 ) -> DocumentResponse:
     storage_dir = Path(settings.storage_dir) / "uploads" / str(tenant_id)
     storage_dir.mkdir(parents=True, exist_ok=True)
-    file_path = storage_dir / file.filename
-    file_path.write_bytes(file.file.read())
-
-    document = Document(
-        tenant_id=tenant_id,
-        source_type="internal",
-        title=title,
-        storage_path=str(file_path),
-    )
-    db.add(document)
-    db.flush()
-
-    file_type = file_path.suffix.replace(".", "")
-    for page_number, paragraph_index, content in extract_paragraphs(file_path, file_type):
-        db.add(
-            DocumentChunk(
-                document_id=document.id,
-                page_number=page_number,
-                paragraph_index=paragraph_index,
-                content=content,
-            )
-        )
+    file_path = storage_dir / Path(file.filename).name
+    content_hash, size_bytes = save_stream(file.file, file_path, settings.upload_block_size)
 
+    result = ingest_document(db, tenant_id, "internal", title, file_path, content_hash, size_bytes)
     db.commit()
+    document = result.document
     db.refresh(document)
-    log_event(db, tenant_id, None, "document.upload", f"Uploaded {file.filename}")
+    stats = result.stats
+    details = f"Uploaded {file.filename} (unchanged)"
+    if result.changed:
+        details = (
+            f"Uploaded {file.filename} ({stats.rows} inserted, {stats.updated} moved, "
+            f"{stats.deleted} deleted, {stats.retired} retired, {stats.unchanged} unchanged chunks, "
+            f"{stats.rows_per_second:.0f} rows/sec)"
+        )
+    log_event(db, tenant_id, None, "document.upload", details)
     return document
 
 
-@router.get("/", response_model=list[DocumentResponse])
-def list_documents(tenant_id: int, db: Session = Depends(get_db)) -> list[DocumentResponse]:
-    return db.query(Document).filter(Document.tenant_id == tenant_id).all()
+@router.get("/", response_model=Page[DocumentResponse])
+def list_documents(
+    tenant_id: int,
+    cursor: str | None = None,
+    limit: int = Query(settings.page_size_default, ge=1, le=settings.page_size_max),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    db: Session = Depends(get_db),
+) -> Page[DocumentResponse]:
+    query = db.query(Document).filter(Document.tenant_id == tenant_id)
+    try:
+        items, next_cursor = paginate(query, Document, cursor, limit, since, until)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return Page[DocumentResponse](items=items, next_cursor=next_cursor)
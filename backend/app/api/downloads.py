@@ -1,24 +1,24 @@
-from io import BytesIO
-from pathlib import Path
-from zipfile import ZIP_DEFLATED, ZipFile
-
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
 
-from app.utils.config import settings
+from app.services.bundle_service import bundle_files, iter_zip
+from app.utils.dependencies import get_db
 
 router = APIRouter()
 
 
 @router.get("/bundle")
-def download_bundle() -> StreamingResponse:
-    storage_dir = Path(settings.storage_dir)
-    buffer = BytesIO()
-    with ZipFile(buffer, "w", ZIP_DEFLATED) as zip_file:
-        if storage_dir.exists():
-            for path in storage_dir.rglob("*"):
-                if path.is_file():
-                    zip_file.write(path, path.relative_to(storage_dir))
-    buffer.seek(0)
-    headers = {"Content-Disposition": "attachment; filename=compliance_bundle.zip"}
-    return StreamingResponse(buffer, media_type="application/zip", headers=headers)
+def download_bundle(
+    tenant_id: int | None = None,
+    run_id: int | None = None,
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    files = bundle_files(db, tenant_id, run_id)
+    name = "compliance_bundle"
+    if tenant_id is not None:
+        name += f"_tenant{tenant_id}"
+    if run_id is not None:
+        name += f"_run{run_id}"
+    headers = {"Content-Disposition": f"attachment; filename={name}.zip"}
+    return StreamingResponse(iter_zip(files), media_type="application/zip", headers=headers)
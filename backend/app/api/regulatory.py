@@ -1,9 +1,12 @@
-from fastapi import APIRouter, BackgroundTasks, Depends
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.models import RegulatorySource
-from app.schemas import RegulatorySourceCreate, RegulatorySourceResponse
-from app.services.regulatory_service import ingest_regulatory_source
+from app.schemas import Page, RegulatorySourceCreate, RegulatorySourceResponse
+from app.services.regulatory_service import ingest_source_job, refresh_all_sources, refresh_lock
+from app.utils.config import settings
 from app.utils.dependencies import get_db
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
@@ -20,9 +23,19 @@ def create_source(
     return source
 
 
-@router.get("/sources", response_model=list[RegulatorySourceResponse])
-def list_sources(db: Session = Depends(get_db)) -> list[RegulatorySourceResponse]:
-    return db.query(RegulatorySource).all()
+@router.get("/sources", response_model=Page[RegulatorySourceResponse])
+def list_sources(
+    cursor: str | None = None,
+    limit: int = Query(settings.page_size_default, ge=1, le=settings.page_size_max),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    db: Session = Depends(get_db),
+) -> Page[RegulatorySourceResponse]:
+    try:
+        items, next_cursor = paginate(db.query(RegulatorySource), RegulatorySource, cursor, limit, since, until)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return Page[RegulatorySourceResponse](items=items, next_cursor=next_cursor)
 
 
 @router.post("/ingest/{source_id}")
@@ -34,5 +47,13 @@ def ingest_source(
     source = db.query(RegulatorySource).filter(RegulatorySource.id == source_id).first()
     if not source:
         return {"status": "not_found"}
-    background_tasks.add_task(ingest_regulatory_source, db, source)
+    background_tasks.add_task(ingest_source_job, source.id)
     return {"status": "queued", "source_id": source_id}
+
+
+@router.post("/refresh")
+def refresh_sources(background_tasks: BackgroundTasks) -> dict:
+    if refresh_lock.locked():
+        return {"status": "already_running"}
+    background_tasks.add_task(refresh_all_sources)
+    return {"status": "queued"}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.schemas import ReportRequest, ReportResponse
 from app.services.report_service import generate_report
@@ -9,5 +9,8 @@ router = APIRouter()
 
 @router.post("/", response_model=ReportResponse)
 def create_report(payload: ReportRequest, db: Session = Depends(get_db)) -> ReportResponse:
-    report = generate_report(db, payload.run_id, payload.title, payload.format)
+    try:
+        report = generate_report(db, payload.run_id, payload.title, payload.format)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     return report
@@ -3,7 +3,9 @@ from fastapi.staticfiles import StaticFiles
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from app.api import audit, compliance, documents, regulatory, reports, downloads
+from app.services import audit_service, job_service
 from app.utils.config import settings
+from app.utils.database import pool_status
 
 app = FastAPI(title="Compliance AI Backend", version="0.1.0")
 
@@ -17,6 +19,17 @@ app.include_router(audit.router, prefix="/audit", tags=["audit"])
 app.include_router(downloads.router, prefix="/downloads", tags=["downloads"])
 
 
+@app.on_event("startup")
+def start_workers() -> None:
+    job_service.start()
+
+
+@app.on_event("shutdown")
+def shutdown_workers() -> None:
+    job_service.shutdown()
+    audit_service.audit_sink.close()
+
+
 @app.get("/")
 def health_check() -> dict:
     return {
@@ -34,3 +47,8 @@ def health_check() -> dict:
         "service": "compliance-ai-backend",
         "model": settings.openai_model,
     }
+
+
+@app.get("/health/db")
+def database_health() -> dict:
+    return pool_status()
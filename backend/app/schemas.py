@@ -1,6 +1,14 @@
 from datetime import datetime
+from typing import Generic, TypeVar
 from pydantic import BaseModel
 
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
 
 class DocumentCreate(BaseModel):
     tenant_id: int
@@ -14,6 +22,7 @@ class DocumentResponse(BaseModel):
     title: str
     source_type: str
     storage_path: str
+    content_hash: str | None = None
     created_at: datetime
 
     class Config:
@@ -29,6 +38,7 @@ class RegulatorySourceCreate(BaseModel):
 class RegulatorySourceResponse(RegulatorySourceCreate):
     id: int
     last_ingested_at: datetime | None
+    created_at: datetime | None = None
 
     class Config:
         from_attributes = True
@@ -44,6 +54,19 @@ class ComplianceResultResponse(BaseModel):
     requirement_id: str
     status: str
     rationale: str
+    prompt_tokens: int | None = None
+
+
+class ComplianceRunResponse(BaseModel):
+    id: int
+    tenant_id: int
+    report_type: str
+    status: str
+    requirement_count: int
+    completed_count: int
+    prompt_tokens: int = 0
+    error: str | None
+    created_at: datetime
 
 
 class ReportRequest(BaseModel):
@@ -59,3 +82,15 @@ class ReportResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class AuditLogResponse(BaseModel):
+    id: int
+    tenant_id: int
+    user_id: int | None
+    action: str
+    details: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
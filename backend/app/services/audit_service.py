@@ -1,10 +1,120 @@
-from sqlalchemy.orm import Session
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
 from app.models import AuditLog
+from app.utils.config import settings
+from app.utils.database import SessionLocal
 
+logger = logging.getLogger(__name__)
 
-def log_event(db: Session, tenant_id: int, user_id: int | None, action: str, details: str) -> AuditLog:
-    entry = AuditLog(tenant_id=tenant_id, user_id=user_id, action=action, details=details)
-    db.add(entry)
-    db.commit()
-    db.refresh(entry)
-    return entry
+
+class AuditSink:
+    def __init__(
+        self,
+        session_factory: sessionmaker = SessionLocal,
+        flush_size: int = settings.audit_flush_size,
+        flush_interval: float = settings.audit_flush_interval_seconds,
+        max_pending: int = settings.audit_max_pending,
+        max_retry_delay: float = settings.audit_max_retry_seconds,
+    ) -> None:
+        self.session_factory = session_factory
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retry_delay = max_retry_delay
+        self._pending: list[dict] = []
+        self._dropped = 0
+        self._retry_delay = 0.0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if time.monotonic() >= self._retry_at:
+                self.flush()
+
+    def emit(self, entry: dict) -> None:
+        with self._lock:
+            # While the database is unreachable the buffer stays bounded; overflow is counted and logged on flush
+            if len(self._pending) >= self.max_pending:
+                self._dropped += 1
+                return
+            self._pending.append(entry)
+            pending = len(self._pending)
+            self._ensure_started()
+        if pending >= self.flush_size:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        written = 0
+        with self._flush_lock:
+            with self._lock:
+                dropped, self._dropped = self._dropped, 0
+            if dropped:
+                logger.error("Dropped %s audit events because %s were already waiting", dropped, self.max_pending)
+            while True:
+                # Rows stay buffered until written, and each attempt sends at most one batch
+                with self._lock:
+                    rows = self._pending[: self.flush_size]
+                if not rows:
+                    break
+                try:
+                    with self.session_factory() as db:
+                        db.execute(insert(AuditLog), rows)
+                        db.commit()
+                except Exception:
+                    self._retry_delay = min(max(self._retry_delay * 2, self.flush_interval), self.max_retry_delay)
+                    self._retry_at = time.monotonic() + self._retry_delay
+                    logger.exception(
+                        "Failed to flush %s audit events, retrying in %.1fs", len(self._pending), self._retry_delay
+                    )
+                    break
+                with self._lock:
+                    del self._pending[: len(rows)]
+                self._retry_delay = 0.0
+                self._retry_at = 0.0
+                written += len(rows)
+        return written
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+audit_sink = AuditSink()
+atexit.register(audit_sink.close)
+
+
+def log_event(db: Session, tenant_id: int, user_id: int | None, action: str, details: str) -> None:
+    entry = {
+        "tenant_id": tenant_id,
+        "user_id": user_id,
+        "action": action,
+        "details": details,
+        "created_at": datetime.utcnow(),
+    }
+    if settings.audit_sync:
+        db.add(AuditLog(**entry))
+        db.commit()
+        return
+    audit_sink.emit(entry)
@@ -0,0 +1,87 @@
+from collections.abc import Iterator
+from pathlib import Path
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZIP64_LIMIT, ZipFile, ZipInfo
+from sqlalchemy.orm import Session
+from app.models import ComplianceRun, Document, Evidence, Report
+from app.utils.config import settings
+
+STORED_SUFFIXES = {".pdf", ".docx", ".xlsx", ".zip", ".gz", ".png", ".jpg", ".jpeg", ".gif"}
+
+
+class _ZipSink:
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _storage_files(storage_dir: Path, paths: list[Path]) -> list[tuple[Path, str]]:
+    files: dict[str, Path] = {}
+    root = storage_dir.resolve()
+    for path in paths:
+        resolved = path.resolve()
+        if not resolved.is_file() or resolved.name.endswith(".part") or not resolved.is_relative_to(root):
+            continue
+        files[resolved.relative_to(root).as_posix()] = resolved
+    return [(path, arcname) for arcname, path in sorted(files.items())]
+
+
+def bundle_files(db: Session, tenant_id: int | None = None, run_id: int | None = None) -> list[tuple[Path, str]]:
+    storage_dir = Path(settings.storage_dir)
+    if not storage_dir.exists():
+        return []
+    if run_id is None and tenant_id is None:
+        return _storage_files(storage_dir, list(storage_dir.rglob("*")))
+
+    paths: list[Path] = []
+    reports = db.query(Report.output_path).join(ComplianceRun, ComplianceRun.id == Report.run_id)
+    if run_id is not None:
+        reports = reports.filter(Report.run_id == run_id)
+        cited = (
+            db.query(Document.storage_path)
+            .join(Evidence, Evidence.document_id == Document.id)
+            .filter(Evidence.run_id == run_id)
+            .distinct()
+        )
+        if tenant_id is not None:
+            reports = reports.filter(ComplianceRun.tenant_id == tenant_id)
+            cited = cited.filter(Document.tenant_id == tenant_id)
+        paths.extend(Path(storage_path) for (storage_path,) in cited)
+    else:
+        reports = reports.filter(ComplianceRun.tenant_id == tenant_id)
+        paths.extend((storage_dir / "uploads" / str(tenant_id)).rglob("*"))
+    paths.extend(Path(output_path) for (output_path,) in reports)
+    return _storage_files(storage_dir, paths)
+
+
+def iter_zip(files: list[tuple[Path, str]], block_size: int | None = None) -> Iterator[bytes]:
+    block_size = block_size or settings.upload_block_size
+    sink = _ZipSink()
+    with ZipFile(sink, "w") as archive:
+        for path, arcname in files:
+            info = ZipInfo.from_file(path, arcname)
+            info.compress_type = ZIP_STORED if path.suffix.lower() in STORED_SUFFIXES else ZIP_DEFLATED
+            force_zip64 = info.file_size >= ZIP64_LIMIT
+            with path.open("rb") as source, archive.open(info, "w", force_zip64=force_zip64) as target:
+                while block := source.read(block_size):
+                    target.write(block)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            yield sink.drain()
+    yield sink.drain()
@@ -1,55 +1,102 @@
-from collections import Counter
 from sqlalchemy.orm import Session
-from app.models import ComplianceResult, DocumentChunk, Evidence
+from app.models import ComplianceResult, ComplianceRun, Document, DocumentChunk, Evidence
+from app.services.index_service import search_chunks_batch, tokenize
 from app.services.openai_client import OpenAIClient
+from app.services.prompt_builder import EvidenceItem, PackedPrompt, pack_evidence
+from app.services.ranking import RankingEngine, get_ranking_engine
+from app.services.summarization_service import summarize_requirements
+from app.utils.config import settings
 
 
-def _tokenize(text: str) -> list[str]:
-    return [token.lower() for token in text.replace("/", " ").split() if len(token) > 3]
+def find_candidate_chunks(
+    db: Session,
+    requirement: str,
+    limit: int = 5,
+    tenant_id: int | None = None,
+    source_types: list[str] | None = None,
+    engine: RankingEngine | None = None,
+) -> list[tuple[float, DocumentChunk]]:
+    return find_candidate_chunks_batch(db, [requirement], limit, tenant_id, source_types, engine)[0]
 
 
-def _score_chunk(requirement_tokens: list[str], content: str) -> int:
-    chunk_tokens = Counter(_tokenize(content))
-    return sum(chunk_tokens.get(token, 0) for token in requirement_tokens)
+def find_candidate_chunks_batch(
+    db: Session,
+    requirements: list[str],
+    limit: int = 5,
+    tenant_id: int | None = None,
+    source_types: list[str] | None = None,
+    engine: RankingEngine | None = None,
+) -> list[list[tuple[float, DocumentChunk]]]:
+    token_lists = [tokenize(requirement) for requirement in requirements]
+    return search_chunks_batch(db, token_lists, limit, engine or get_ranking_engine(), tenant_id, source_types)
 
 
-def find_candidate_chunks(db: Session, requirement: str, limit: int = 5) -> list[tuple[int, DocumentChunk]]:
-    tokens = _tokenize(requirement)
-    if not tokens:
-        return []
-    candidates = db.query(DocumentChunk).limit(2000).all()
-    scored: list[tuple[int, DocumentChunk]] = []
-    for chunk in candidates:
-        score = _score_chunk(tokens, chunk.content)
-        if score > 0:
-            scored.append((score, chunk))
-    scored.sort(key=lambda item: item[0], reverse=True)
-    return scored[:limit]
+def build_prompts(
+    db: Session,
+    requirements: list[str],
+    candidates: list[list[tuple[float, DocumentChunk]]],
+) -> list[PackedPrompt]:
+    document_ids = {chunk.document_id for scored_chunks in candidates for _, chunk in scored_chunks}
+    titles = {}
+    if document_ids:
+        titles = dict(db.query(Document.id, Document.title).filter(Document.id.in_(document_ids)).all())
+    return [
+        pack_evidence(
+            requirement,
+            [
+                EvidenceItem(
+                    text=chunk.content,
+                    score=score,
+                    document_title=titles.get(chunk.document_id),
+                    page_number=chunk.page_number,
+                    paragraph_index=chunk.paragraph_index,
+                )
+                for score, chunk in scored_chunks
+            ],
+        )
+        for requirement, scored_chunks in zip(requirements, candidates)
+    ]
 
 
-def evaluate_requirements(db: Session, run_id: int, requirements: list[str]) -> list[ComplianceResult]:
-    client = OpenAIClient()
+def evaluate_requirements(
+    db: Session,
+    run_id: int,
+    requirements: list[str],
+    client: OpenAIClient | None = None,
+) -> list[ComplianceResult]:
+    client = client or OpenAIClient()
+    engine = get_ranking_engine()
+    run = db.get(ComplianceRun, run_id)
+    candidates = find_candidate_chunks_batch(
+        db,
+        requirements,
+        tenant_id=run.tenant_id,
+        source_types=settings.evidence_source_types,
+        engine=engine,
+    )
+    packed = build_prompts(db, requirements, candidates)
+    rationales = summarize_requirements(
+        client, [(requirement, prompt.evidence) for requirement, prompt in zip(requirements, packed)]
+    )
     results: list[ComplianceResult] = []
-    for requirement in requirements:
-        scored_chunks = find_candidate_chunks(db, requirement)
-        evidence_texts = [chunk.content for _, chunk in scored_chunks]
-        rationale = client.summarize_with_evidence(requirement, evidence_texts)
+    for requirement, scored_chunks, prompt, rationale in zip(requirements, candidates, packed, rationales):
+        confidences = [engine.confidence(score) for score, _ in scored_chunks]
         status = "fail"
         if scored_chunks:
-            has_high = any(score >= 3 for score, _ in scored_chunks)
-            status = "pass" if has_high else "partial"
+            status = "pass" if "high" in confidences else "partial"
 
         result = ComplianceResult(
             run_id=run_id,
             requirement_id=requirement,
             status=status,
             rationale=rationale,
+            prompt_tokens=prompt.prompt_tokens,
         )
         db.add(result)
-        for score, chunk in scored_chunks:
-            confidence = "high" if score >= 3 else "medium" if score == 2 else "low"
+        for (_, chunk), confidence in zip(scored_chunks, confidences):
             db.add(
                 Evidence(
+                    run_id=run_id,
                     requirement_id=requirement,
                     document_id=chunk.document_id,
                     chunk_id=chunk.id,
@@ -57,5 +104,7 @@ def evaluate_requirements(db: Session, run_id: int, requirements: list[str]) ->
                 )
             )
         results.append(result)
+        if len(results) % settings.compliance_commit_batch == 0:
+            db.commit()
     db.commit()
     return results
@@ -1,18 +1,89 @@
+import hashlib
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Iterable
+from typing import BinaryIO, Iterable
 from docx import Document as DocxDocument
 from pypdf import PdfReader
+from app.utils.config import settings
 
 
-def extract_pdf_paragraphs(file_path: Path) -> Iterable[tuple[int, int, str]]:
-    reader = PdfReader(str(file_path))
-    for page_index, page in enumerate(reader.pages, start=1):
-        text = page.extract_text() or ""
-        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
-        if not paragraphs:
-            paragraphs = [p.strip() for p in text.split("\n") if p.strip()]
-        for paragraph_index, paragraph in enumerate(paragraphs, start=1):
-            yield page_index, paragraph_index, paragraph
+def save_stream(source: BinaryIO, destination: Path, block_size: int) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    partial_path = destination.with_name(destination.name + ".part")
+    with partial_path.open("wb") as target:
+        while True:
+            block = source.read(block_size)
+            if not block:
+                break
+            digest.update(block)
+            target.write(block)
+            size += len(block)
+    os.replace(partial_path, destination)
+    return digest.hexdigest(), size
+
+
+def hash_file(file_path: Path, block_size: int) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    with file_path.open("rb") as handle:
+        while block := handle.read(block_size):
+            digest.update(block)
+            size += len(block)
+    return digest.hexdigest(), size
+
+
+def _page_paragraphs(page_index: int, text: str) -> list[tuple[int, int, str]]:
+    paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+    if not paragraphs:
+        paragraphs = [p.strip() for p in text.split("\n") if p.strip()]
+    return [(page_index, index, paragraph) for index, paragraph in enumerate(paragraphs, start=1)]
+
+
+def _extract_pdf_page_range(file_path: str, start: int, end: int) -> list[tuple[int, int, str]]:
+    with open(file_path, "rb") as handle:
+        reader = PdfReader(handle)
+        rows: list[tuple[int, int, str]] = []
+        for page_index in range(start, end):
+            rows.extend(_page_paragraphs(page_index + 1, reader.pages[page_index].extract_text() or ""))
+        return rows
+
+
+def _extract_pdf_parallel(
+    file_path: Path,
+    page_count: int,
+    workers: int,
+    pages_per_task: int,
+) -> Iterable[tuple[int, int, str]]:
+    ranges = ((start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending: deque[Future] = deque(
+            pool.submit(_extract_pdf_page_range, str(file_path), start, end)
+            for start, end in islice(ranges, workers * 2)
+        )
+        while pending:
+            rows = pending.popleft().result()
+            next_range = next(ranges, None)
+            if next_range:
+                pending.append(pool.submit(_extract_pdf_page_range, str(file_path), *next_range))
+            yield from rows
+
+
+def extract_pdf_paragraphs(file_path: Path, workers: int | None = None) -> Iterable[tuple[int, int, str]]:
+    workers = settings.pdf_extract_workers if workers is None else workers
+    pages_per_task = settings.pdf_pages_per_task
+    with file_path.open("rb") as handle:
+        reader = PdfReader(handle)
+        page_count = len(reader.pages)
+        if workers <= 1 or page_count <= pages_per_task:
+            for page_index, page in enumerate(reader.pages, start=1):
+                yield from _page_paragraphs(page_index, page.extract_text() or "")
+            return
+    yield from _extract_pdf_parallel(file_path, page_count, workers, pages_per_task)
 
 
 def extract_docx_paragraphs(file_path: Path) -> Iterable[tuple[int, int, str]]:
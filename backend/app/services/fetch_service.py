@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from app.utils.config import settings
+
+USER_AGENT = "compliance-ai-fetcher/0.1"
+
+
+@dataclass
+class FetchResult:
+    path: Path
+    changed: bool
+    status: int
+    etag: str | None
+    last_modified: str | None
+    content_hash: str | None = None
+    size_bytes: int = 0
+
+
+def _partial_paths(destination: Path) -> tuple[Path, Path]:
+    return destination.with_name(destination.name + ".part"), destination.with_name(destination.name + ".part.json")
+
+
+def _resume_state(partial_path: Path, meta_path: Path) -> tuple[int, str | None]:
+    if not partial_path.exists() or not meta_path.exists():
+        partial_path.unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+        return 0, None
+    meta = json.loads(meta_path.read_text())
+    validator = meta.get("etag") or meta.get("last_modified")
+    if not validator:
+        partial_path.unlink()
+        meta_path.unlink()
+        return 0, None
+    return partial_path.stat().st_size, validator
+
+
+def fetch_to_file(
+    url: str,
+    destination: Path,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    block_size: int | None = None,
+    timeout: float | None = None,
+) -> FetchResult:
+    block_size = block_size or settings.upload_block_size
+    timeout = timeout or settings.fetch_timeout_seconds
+    partial_path, meta_path = _partial_paths(destination)
+    offset, resume_validator = _resume_state(partial_path, meta_path)
+
+    headers = {"User-Agent": USER_AGENT}
+    if destination.exists():
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    if offset and resume_validator:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = resume_validator
+
+    try:
+        response = urlopen(Request(url, headers=headers), timeout=timeout)
+    except HTTPError as exc:
+        if exc.code == 304:
+            return FetchResult(path=destination, changed=False, status=304, etag=etag, last_modified=last_modified)
+        if exc.code == 416 and offset:
+            partial_path.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+            return fetch_to_file(url, destination, etag, last_modified, block_size, timeout)
+        raise
+
+    with response:
+        digest = hashlib.sha256()
+        new_etag = response.headers.get("ETag")
+        new_last_modified = response.headers.get("Last-Modified")
+        if response.status == 206:
+            with partial_path.open("rb") as existing:
+                while block := existing.read(block_size):
+                    digest.update(block)
+            mode = "ab"
+        else:
+            meta_path.write_text(json.dumps({"etag": new_etag, "last_modified": new_last_modified}))
+            mode = "wb"
+        with partial_path.open(mode) as target:
+            while block := response.read(block_size):
+                digest.update(block)
+                target.write(block)
+
+    if response.status == 206:
+        meta = json.loads(meta_path.read_text())
+        new_etag = meta.get("etag")
+        new_last_modified = meta.get("last_modified")
+    size_bytes = partial_path.stat().st_size
+    os.replace(partial_path, destination)
+    meta_path.unlink(missing_ok=True)
+    return FetchResult(
+        path=destination,
+        changed=True,
+        status=response.status,
+        etag=new_etag,
+        last_modified=new_last_modified,
+        content_hash=digest.hexdigest(),
+        size_bytes=size_bytes,
+    )
@@ -0,0 +1,162 @@
+from collections import Counter
+import numpy as np
+from scipy import sparse
+from sqlalchemy import Select, delete, func, insert, select
+from sqlalchemy.orm import Session
+from app.models import ChunkTerm, Document, DocumentChunk
+from app.services.ranking import CorpusStats, RankingEngine
+
+MAX_TERM_LENGTH = 100
+
+
+def tokenize(text: str) -> list[str]:
+    return [token.lower()[:MAX_TERM_LENGTH] for token in text.replace("/", " ").split() if len(token) > 3]
+
+
+def index_tokens(db: Session, chunk_tokens: list[tuple[int, list[str]]]) -> int:
+    rows = []
+    for chunk_id, tokens in chunk_tokens:
+        for term, tf in Counter(tokens).items():
+            rows.append({"term": term, "chunk_id": chunk_id, "tf": tf})
+    if rows:
+        db.execute(insert(ChunkTerm), rows)
+    return len(rows)
+
+
+def unindex_chunks(db: Session, chunk_ids: list[int]) -> int:
+    return db.execute(delete(ChunkTerm).where(ChunkTerm.chunk_id.in_(chunk_ids))).rowcount
+
+
+def index_chunks(db: Session, chunks: list[DocumentChunk]) -> int:
+    chunk_tokens = []
+    for chunk in chunks:
+        tokens = tokenize(chunk.content)
+        chunk.token_count = len(tokens)
+        chunk_tokens.append((chunk.id, tokens))
+    return index_tokens(db, chunk_tokens)
+
+
+def rebuild_index(db: Session, batch_size: int = 1000) -> int:
+    db.query(ChunkTerm).delete()
+    postings = 0
+    batch: list[DocumentChunk] = []
+    chunks = db.query(DocumentChunk).filter(DocumentChunk.retired_at.is_(None)).order_by(DocumentChunk.id)
+    for chunk in chunks.yield_per(batch_size):
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            postings += index_chunks(db, batch)
+            batch = []
+    postings += index_chunks(db, batch)
+    db.commit()
+    return postings
+
+
+def _scope(query: Select, tenant_id: int | None, source_types: list[str] | None) -> Select:
+    if tenant_id is None and not source_types:
+        return query
+    query = query.join(Document, Document.id == DocumentChunk.document_id)
+    if tenant_id is not None:
+        query = query.where(Document.tenant_id == tenant_id)
+    if source_types:
+        query = query.where(Document.source_type.in_(source_types))
+    return query
+
+
+def corpus_stats_query(tenant_id: int | None = None, source_types: list[str] | None = None) -> Select:
+    return _scope(
+        select(func.count(DocumentChunk.id), func.coalesce(func.avg(DocumentChunk.token_count), 0)).where(
+            DocumentChunk.retired_at.is_(None)
+        ),
+        tenant_id,
+        source_types,
+    )
+
+
+def corpus_stats(db: Session, tenant_id: int | None = None, source_types: list[str] | None = None) -> CorpusStats:
+    # Statistics come from the same slice that is searched, so other tenants' documents never shift scores
+    chunk_count, avg_length = db.execute(corpus_stats_query(tenant_id, source_types)).one()
+    return CorpusStats(chunk_count=chunk_count, avg_chunk_length=float(avg_length))
+
+
+def _query_matrix(token_lists: list[list[str]]) -> tuple[sparse.csr_matrix, list[str]]:
+    term_index: dict[str, int] = {}
+    rows, cols, data = [], [], []
+    for row, tokens in enumerate(token_lists):
+        for term, count in Counter(tokens).items():
+            rows.append(row)
+            cols.append(term_index.setdefault(term, len(term_index)))
+            data.append(count)
+    matrix = sparse.csr_matrix((data, (rows, cols)), shape=(len(token_lists), len(term_index)), dtype=np.float64)
+    return matrix, list(term_index)
+
+
+def postings_query(terms: list[str], tenant_id: int | None = None, source_types: list[str] | None = None) -> Select:
+    query = (
+        select(ChunkTerm.chunk_id, ChunkTerm.term, ChunkTerm.tf, DocumentChunk.token_count)
+        .join(DocumentChunk, DocumentChunk.id == ChunkTerm.chunk_id)
+        .where(ChunkTerm.term.in_(terms))
+    )
+    return _scope(query, tenant_id, source_types)
+
+
+def search_chunks_batch(
+    db: Session,
+    token_lists: list[list[str]],
+    limit: int,
+    engine: RankingEngine,
+    tenant_id: int | None = None,
+    source_types: list[str] | None = None,
+) -> list[list[tuple[float, DocumentChunk]]]:
+    queries, terms = _query_matrix(token_lists)
+    if not terms:
+        return [[] for _ in token_lists]
+    rows = db.execute(postings_query(terms, tenant_id, source_types)).all()
+    if not rows:
+        return [[] for _ in token_lists]
+
+    term_index = {term: index for index, term in enumerate(terms)}
+    chunk_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    term_ids = np.fromiter((term_index[row[1]] for row in rows), dtype=np.int64, count=len(rows))
+    tf = np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows))
+    lengths = np.fromiter((row[3] or 0 for row in rows), dtype=np.float64, count=len(rows))
+    # Each posting is a distinct (term, chunk) pair inside the slice, so counting them gives the slice's doc_freq
+    doc_freq = np.bincount(term_ids, minlength=len(terms)).astype(np.float64)
+    stats = corpus_stats(db, tenant_id, source_types)
+
+    columns, chunk_columns = np.unique(chunk_ids, return_inverse=True)
+    weights = sparse.csr_matrix(
+        (engine.weights(tf, lengths, doc_freq[term_ids], stats), (term_ids, chunk_columns)),
+        shape=(len(terms), len(columns)),
+    )
+    scores = (queries @ weights).tocsr()
+    bounds = engine.term_bounds(doc_freq, stats)
+    if bounds is not None:
+        # Report scores as a share of the best score the query could reach, which keeps them comparable across corpora
+        query_bounds = queries @ bounds
+        scale = np.divide(1.0, query_bounds, out=np.zeros_like(query_bounds), where=query_bounds > 0)
+        scores = (sparse.diags(scale) @ scores).tocsr()
+
+    ranked: list[list[tuple[float, int]]] = []
+    for row in range(scores.shape[0]):
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        row_scores = scores.data[start:end]
+        row_chunks = columns[scores.indices[start:end]]
+        order = np.lexsort((row_chunks, -row_scores))[:limit]
+        ranked.append([(float(row_scores[i]), int(row_chunks[i])) for i in order if row_scores[i] > 0])
+
+    needed = {chunk_id for row in ranked for _, chunk_id in row}
+    chunks = {}
+    if needed:
+        chunks = {chunk.id: chunk for chunk in db.query(DocumentChunk).filter(DocumentChunk.id.in_(needed))}
+    return [[(score, chunks[chunk_id]) for score, chunk_id in row] for row in ranked]
+
+
+def search_chunks(
+    db: Session,
+    tokens: list[str],
+    limit: int,
+    engine: RankingEngine,
+    tenant_id: int | None = None,
+    source_types: list[str] | None = None,
+) -> list[tuple[float, DocumentChunk]]:
+    return search_chunks_batch(db, [tokens], limit, engine, tenant_id, source_types)[0]
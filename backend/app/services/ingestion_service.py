@@ -0,0 +1,219 @@
+import hashlib
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+from app.models import Document, DocumentChunk, Evidence
+from app.services.document_service import extract_paragraphs
+from app.services.index_service import index_tokens, tokenize, unindex_chunks
+from app.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+DELETE_BATCH_SIZE = 500
+
+
+def content_digest(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class IngestStats:
+    rows: int = 0
+    batches: int = 0
+    updated: int = 0
+    deleted: int = 0
+    retired: int = 0
+    unchanged: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class IngestResult:
+    document: Document
+    changed: bool
+    stats: IngestStats
+
+
+class ChunkWriter:
+    def __init__(self, db: Session, document_id: int, batch_size: int | None = None) -> None:
+        self.db = db
+        self.document_id = document_id
+        self.batch_size = batch_size or settings.ingest_batch_size
+        self.stats = IngestStats()
+        self._rows: list[dict] = []
+        self._tokens: list[list[str]] = []
+        self._started = time.perf_counter()
+
+    def add(
+        self,
+        page_number: int | None,
+        paragraph_index: int | None,
+        content: str,
+        content_hash: str | None = None,
+    ) -> None:
+        tokens = tokenize(content)
+        self._rows.append(
+            {
+                "document_id": self.document_id,
+                "page_number": page_number,
+                "paragraph_index": paragraph_index,
+                "content": content,
+                "content_hash": content_hash or content_digest(content),
+                "token_count": len(tokens),
+            }
+        )
+        self._tokens.append(tokens)
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        chunk_ids = self.db.scalars(
+            insert(DocumentChunk).returning(DocumentChunk.id, sort_by_parameter_order=True),
+            self._rows,
+        ).all()
+        index_tokens(self.db, list(zip(chunk_ids, self._tokens)))
+        self.stats.rows += len(self._rows)
+        self.stats.batches += 1
+        self._rows = []
+        self._tokens = []
+
+    def close(self) -> IngestStats:
+        self.flush()
+        self.stats.seconds = time.perf_counter() - self._started
+        logger.info(
+            "Wrote %s chunks for document %s in %s batches (%.0f rows/sec)",
+            self.stats.rows,
+            self.document_id,
+            self.stats.batches,
+            self.stats.rows_per_second,
+        )
+        return self.stats
+
+
+def write_document_chunks(
+    db: Session,
+    document_id: int,
+    paragraphs: Iterable[tuple[int | None, int | None, str]],
+    batch_size: int | None = None,
+) -> IngestStats:
+    writer = ChunkWriter(db, document_id, batch_size)
+    for page_number, paragraph_index, content in paragraphs:
+        writer.add(page_number, paragraph_index, content)
+    return writer.close()
+
+
+def delete_chunks(db: Session, chunk_ids: list[int]) -> int:
+    for start in range(0, len(chunk_ids), DELETE_BATCH_SIZE):
+        batch = chunk_ids[start : start + DELETE_BATCH_SIZE]
+        unindex_chunks(db, batch)
+        db.execute(delete(DocumentChunk).where(DocumentChunk.id.in_(batch)))
+    return len(chunk_ids)
+
+
+def retire_chunks(db: Session, chunk_ids: list[int]) -> int:
+    # Cited chunks stay as they were cited; they only drop out of the index
+    retired_at = datetime.utcnow()
+    for start in range(0, len(chunk_ids), DELETE_BATCH_SIZE):
+        batch = chunk_ids[start : start + DELETE_BATCH_SIZE]
+        unindex_chunks(db, batch)
+        db.execute(update(DocumentChunk).where(DocumentChunk.id.in_(batch)).values(retired_at=retired_at))
+    return len(chunk_ids)
+
+
+def sync_document_chunks(
+    db: Session,
+    document_id: int,
+    paragraphs: Iterable[tuple[int | None, int | None, str]],
+    batch_size: int | None = None,
+) -> IngestStats:
+    existing: dict[str | None, list[tuple[int, int | None, int | None]]] = defaultdict(list)
+    rows = db.execute(
+        select(DocumentChunk.id, DocumentChunk.content_hash, DocumentChunk.page_number, DocumentChunk.paragraph_index)
+        .where(DocumentChunk.document_id == document_id, DocumentChunk.retired_at.is_(None))
+        .order_by(DocumentChunk.id)
+    )
+    for chunk_id, content_hash, page_number, paragraph_index in rows:
+        existing[content_hash].append((chunk_id, page_number, paragraph_index))
+    cited = set(
+        db.scalars(
+            select(Evidence.chunk_id)
+            .join(DocumentChunk, DocumentChunk.id == Evidence.chunk_id)
+            .where(DocumentChunk.document_id == document_id, DocumentChunk.retired_at.is_(None))
+            .distinct()
+        )
+    )
+
+    writer = ChunkWriter(db, document_id, batch_size)
+    moved: list[dict] = []
+    retired: list[int] = []
+    unchanged = 0
+    for page_number, paragraph_index, content in paragraphs:
+        content_hash = content_digest(content)
+        matches = existing.get(content_hash)
+        if not matches:
+            writer.add(page_number, paragraph_index, content, content_hash)
+            continue
+        chunk_id, old_page, old_paragraph = matches.pop(0)
+        if (old_page, old_paragraph) == (page_number, paragraph_index):
+            unchanged += 1
+        elif chunk_id in cited:
+            retired.append(chunk_id)
+            writer.add(page_number, paragraph_index, content, content_hash)
+        else:
+            moved.append({"id": chunk_id, "page_number": page_number, "paragraph_index": paragraph_index})
+    stats = writer.close()
+
+    if moved:
+        db.execute(update(DocumentChunk), moved)
+    for matches in existing.values():
+        retired.extend(chunk_id for chunk_id, _, _ in matches if chunk_id in cited)
+    stale = [chunk_id for matches in existing.values() for chunk_id, _, _ in matches if chunk_id not in cited]
+    stats.updated = len(moved)
+    stats.deleted = delete_chunks(db, stale)
+    stats.retired = retire_chunks(db, retired)
+    stats.unchanged = unchanged
+    return stats
+
+
+def ingest_document(
+    db: Session,
+    tenant_id: int,
+    source_type: str,
+    title: str,
+    file_path: Path,
+    content_hash: str,
+    size_bytes: int,
+) -> IngestResult:
+    document = (
+        db.query(Document)
+        .filter(Document.tenant_id == tenant_id, Document.storage_path == str(file_path))
+        .order_by(Document.id.desc())
+        .first()
+    )
+    if document is not None and document.content_hash == content_hash:
+        document.title = title
+        return IngestResult(document=document, changed=False, stats=IngestStats())
+
+    if document is None:
+        document = Document(tenant_id=tenant_id, source_type=source_type, title=title, storage_path=str(file_path))
+        db.add(document)
+    document.title = title
+    document.content_hash = content_hash
+    document.size_bytes = size_bytes
+    db.flush()
+
+    file_type = file_path.suffix.replace(".", "")
+    stats = sync_document_chunks(db, document.id, extract_paragraphs(file_path, file_type))
+    return IngestResult(document=document, changed=True, stats=stats)
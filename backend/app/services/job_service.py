@@ -0,0 +1,117 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import ColumnElement, func, update
+from app.models import ComplianceRun
+from app.services.audit_service import log_event
+from app.services.compliance_service import evaluate_requirements
+from app.utils.config import settings
+from app.utils.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(max_workers=settings.compliance_workers, thread_name_prefix="compliance-run")
+pending: dict[int, Future] = {}
+
+UNFINISHED_STATUSES = ("queued", "running")
+
+_instance = uuid.uuid4().hex[:8]
+_heartbeat_stopped = threading.Event()
+_heartbeat_lock = threading.Lock()
+_heartbeat_thread: threading.Thread | None = None
+
+
+def worker_id() -> str:
+    # Includes the pid so workers forked from one parent still get distinct ids
+    return f"{socket.gethostname()}:{os.getpid()}:{_instance}"
+
+
+def execute_run(run_id: int, requirements: list[str]) -> None:
+    db = SessionLocal()
+    try:
+        run = db.get(ComplianceRun, run_id)
+        run.status = "running"
+        db.commit()
+        try:
+            evaluate_requirements(db, run_id, requirements)
+        except Exception as exc:
+            logger.exception("Compliance run %s failed", run_id)
+            db.rollback()
+            run.status = "failed"
+            run.error = str(exc)
+            db.commit()
+            return
+        run.status = "completed"
+        db.commit()
+        log_event(db, run.tenant_id, None, "compliance.run", f"Run {run.id} for {run.report_type}")
+    finally:
+        db.close()
+
+
+def _update_runs(condition: ColumnElement[bool], **values) -> int:
+    db = SessionLocal()
+    try:
+        updated = db.execute(update(ComplianceRun).where(condition).values(**values)).rowcount
+        db.commit()
+    finally:
+        db.close()
+    return updated
+
+
+def fail_runs(condition: ColumnElement[bool], error: str) -> int:
+    failed = _update_runs(condition & ComplianceRun.status.in_(UNFINISHED_STATUSES), status="failed", error=error)
+    if failed:
+        logger.warning("Marked %s compliance runs as failed: %s", failed, error)
+    return failed
+
+
+def fail_orphaned_runs() -> int:
+    # A run is orphaned once its owning worker stops heartbeating, whichever process notices first
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.run_orphan_after_seconds)
+    last_seen = func.coalesce(ComplianceRun.heartbeat_at, ComplianceRun.created_at)
+    return fail_runs(last_seen < cutoff, "Interrupted: the worker running it stopped before completion")
+
+
+def _heartbeat() -> None:
+    while not _heartbeat_stopped.wait(settings.run_heartbeat_seconds):
+        try:
+            run_ids = list(pending)
+            if run_ids:
+                _update_runs(
+                    ComplianceRun.id.in_(run_ids) & (ComplianceRun.worker_id == worker_id()),
+                    heartbeat_at=datetime.utcnow(),
+                )
+            fail_orphaned_runs()
+        except Exception:
+            logger.exception("Compliance run heartbeat failed")
+
+
+def start() -> None:
+    global _heartbeat_thread
+    fail_orphaned_runs()
+    with _heartbeat_lock:
+        if _heartbeat_thread is None or not _heartbeat_thread.is_alive():
+            _heartbeat_stopped.clear()
+            _heartbeat_thread = threading.Thread(target=_heartbeat, name="compliance-heartbeat", daemon=True)
+            _heartbeat_thread.start()
+
+
+def submit_run(run_id: int, requirements: list[str]) -> Future:
+    _update_runs(ComplianceRun.id == run_id, worker_id=worker_id(), heartbeat_at=datetime.utcnow())
+    future = executor.submit(execute_run, run_id, requirements)
+    pending[run_id] = future
+    future.add_done_callback(lambda _: pending.pop(run_id, None))
+    return future
+
+
+def shutdown() -> None:
+    queued = dict(pending)
+    executor.shutdown(wait=True, cancel_futures=True)
+    _heartbeat_stopped.set()
+    cancelled = [run_id for run_id, future in queued.items() if future.cancelled()]
+    if cancelled:
+        fail_runs(ComplianceRun.id.in_(cancelled), "Cancelled by server shutdown")
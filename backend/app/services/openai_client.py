@@ -1,30 +1,59 @@
 from openai import OpenAI
+from app.services.rationale_cache import RationaleCache, cache_key, rationale_cache
 from app.utils.config import settings
 
+PROMPT_TEMPLATE = (
+    "Summarize the compliance status for the requirement using only the evidence. "
+    "If evidence is missing, say so explicitly.\n\n"
+    "Requirement: {requirement}\n\nEvidence:\n{evidence}"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
 
 class OpenAIClient:
-    def __init__(self) -> None:
+    def __init__(self, cache: RationaleCache | None = None) -> None:
         self.disabled = settings.openai_disabled
         self.client = None
+        self.cache = None
         if not self.disabled:
             if not settings.openai_api_key:
                 raise ValueError("OPENAI_API_KEY is required")
-            self.client = OpenAI(api_key=settings.openai_api_key)
+            self.client = OpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url, max_retries=0)
+            if cache is not None:
+                self.cache = cache
+            elif settings.rationale_cache_enabled:
+                self.cache = rationale_cache
+
+    def build_prompt(self, requirement: str, evidence: list[str]) -> str:
+        return PROMPT_TEMPLATE.format(requirement=requirement, evidence="\n".join(evidence))
 
-    def summarize_with_evidence(self, requirement: str, evidence: list[str]) -> str:
+    def cache_key(self, requirement: str, evidence: list[str]) -> str:
+        return cache_key(settings.openai_model, PROMPT_TEMPLATE, requirement, evidence)
+
+    def cached_summary(self, requirement: str, evidence: list[str]) -> str | None:
+        if self.disabled or self.cache is None:
+            return None
+        return self.cache.get(self.cache_key(requirement, evidence))
+
+    def summarize_with_evidence(self, requirement: str, evidence: list[str], check_cache: bool = True) -> str:
         if self.disabled:
             if not evidence:
                 return f"Requirement: {requirement}\nEvidence missing."
             snippet = evidence[0][:600]
             return f"Requirement: {requirement}\nEvidence snippet: {snippet}"
 
-        prompt = (
-            "Summarize the compliance status for the requirement using only the evidence. "
-            "If evidence is missing, say so explicitly.\n\n"
-            f"Requirement: {requirement}\n\nEvidence:\n" + "\n".join(evidence)
-        )
+        if check_cache:
+            cached = self.cached_summary(requirement, evidence)
+            if cached is not None:
+                return cached
+
         response = self.client.responses.create(
             model=settings.openai_model,
-            input=prompt,
+            input=self.build_prompt(requirement, evidence),
         )
+        if self.cache is not None:
+            self.cache.put(self.cache_key(requirement, evidence), settings.openai_model, response.output_text)
         return response.output_text
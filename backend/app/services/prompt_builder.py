@@ -0,0 +1,98 @@
+import hashlib
+import re
+from dataclasses import dataclass
+from app.services.openai_client import PROMPT_TEMPLATE, estimate_tokens
+from app.utils.config import settings
+
+SHINGLE_SIZE = 5
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+@dataclass
+class EvidenceItem:
+    text: str
+    score: float
+    document_title: str | None = None
+    page_number: int | None = None
+    paragraph_index: int | None = None
+
+    def citation(self) -> str:
+        page_info = f"page {self.page_number}" if self.page_number else "page n/a"
+        paragraph_info = f"paragraph {self.paragraph_index}" if self.paragraph_index else "paragraph n/a"
+        return f"[{self.document_title or 'unknown document'}, {page_info}, {paragraph_info}]"
+
+    def line(self) -> str:
+        return f"{self.citation()} {self.text}"
+
+
+@dataclass
+class PackedPrompt:
+    evidence: list[str]
+    items: list[EvidenceItem]
+    duplicates: int
+    trimmed: int
+    prompt_tokens: int
+
+
+def _words(text: str) -> list[str]:
+    return _NON_WORD.sub(" ", text.lower()).split()
+
+
+def _shingles(words: list[str]) -> set[str]:
+    if len(words) <= SHINGLE_SIZE:
+        return {" ".join(words)}
+    return {" ".join(words[index : index + SHINGLE_SIZE]) for index in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def dedupe_evidence(items: list[EvidenceItem], threshold: float | None = None) -> tuple[list[EvidenceItem], int]:
+    threshold = settings.evidence_dedupe_threshold if threshold is None else threshold
+    kept: list[EvidenceItem] = []
+    seen_digests: set[str] = set()
+    kept_shingles: list[set[str]] = []
+    for item in sorted(items, key=lambda candidate: candidate.score, reverse=True):
+        words = _words(item.text)
+        digest = hashlib.sha256(" ".join(words).encode("utf-8")).hexdigest()
+        if digest in seen_digests:
+            continue
+        shingles = _shingles(words)
+        if any(len(shingles & other) / len(shingles | other) >= threshold for other in kept_shingles):
+            continue
+        seen_digests.add(digest)
+        kept_shingles.append(shingles)
+        kept.append(item)
+    return kept, len(items) - len(kept)
+
+
+def pack_evidence(
+    requirement: str,
+    items: list[EvidenceItem],
+    token_budget: int | None = None,
+    template: str = PROMPT_TEMPLATE,
+) -> PackedPrompt:
+    budget = settings.prompt_token_budget if token_budget is None else token_budget
+    unique, duplicates = dedupe_evidence(items)
+    used = estimate_tokens(template.format(requirement=requirement, evidence=""))
+    packed: list[EvidenceItem] = []
+    lines: list[str] = []
+    for item in unique:
+        line = item.line()
+        cost = estimate_tokens(line + "\n")
+        if used + cost > budget:
+            if lines:
+                continue
+            # Always send the best evidence, cut down to what the budget leaves room for
+            line = line[: max(0, budget - used) * 4]
+            if not line:
+                break
+            cost = estimate_tokens(line + "\n")
+        packed.append(item)
+        lines.append(line)
+        used += cost
+    prompt_tokens = estimate_tokens(template.format(requirement=requirement, evidence="\n".join(lines)))
+    return PackedPrompt(
+        evidence=lines,
+        items=packed,
+        duplicates=duplicates,
+        trimmed=len(unique) - len(packed),
+        prompt_tokens=prompt_tokens,
+    )
@@ -0,0 +1,80 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import numpy as np
+from app.utils.config import settings
+
+
+@dataclass
+class CorpusStats:
+    chunk_count: int
+    avg_chunk_length: float
+
+
+class RankingEngine(ABC):
+    name = "base"
+    high_score: float = 0.0
+    medium_score: float = 0.0
+
+    @abstractmethod
+    def weights(self, tf: np.ndarray, chunk_length: np.ndarray, doc_freq: np.ndarray, stats: CorpusStats) -> np.ndarray:
+        ...
+
+    def term_bounds(self, doc_freq: np.ndarray, stats: CorpusStats) -> np.ndarray | None:
+        return None
+
+    def confidence(self, score: float) -> str:
+        if score >= self.high_score:
+            return "high"
+        if score >= self.medium_score:
+            return "medium"
+        return "low"
+
+
+class TermFrequencyRanker(RankingEngine):
+    name = "tf"
+    high_score = 3
+    medium_score = 2
+
+    def weights(self, tf: np.ndarray, chunk_length: np.ndarray, doc_freq: np.ndarray, stats: CorpusStats) -> np.ndarray:
+        return tf.astype(np.float64)
+
+
+class BM25Ranker(RankingEngine):
+    name = "bm25"
+
+    def __init__(
+        self,
+        k1: float = settings.bm25_k1,
+        b: float = settings.bm25_b,
+        high_score: float = settings.bm25_high_confidence,
+        medium_score: float = settings.bm25_medium_confidence,
+    ) -> None:
+        self.k1 = k1
+        self.b = b
+        self.high_score = high_score
+        self.medium_score = medium_score
+
+    def idf(self, doc_freq: np.ndarray, chunk_count: int) -> np.ndarray:
+        return np.log1p((chunk_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    def weights(self, tf: np.ndarray, chunk_length: np.ndarray, doc_freq: np.ndarray, stats: CorpusStats) -> np.ndarray:
+        avg_length = stats.avg_chunk_length or 1.0
+        norm = self.k1 * (1 - self.b + self.b * chunk_length / avg_length)
+        return self.idf(doc_freq, stats.chunk_count) * tf * (self.k1 + 1) / (tf + norm)
+
+    def term_bounds(self, doc_freq: np.ndarray, stats: CorpusStats) -> np.ndarray | None:
+        # BM25 saturates at idf * (k1 + 1); terms absent from the slice cannot be matched and add nothing
+        return np.where(doc_freq > 0, self.idf(doc_freq, stats.chunk_count) * (self.k1 + 1), 0.0)
+
+
+RANKING_ENGINES: dict[str, type[RankingEngine]] = {
+    BM25Ranker.name: BM25Ranker,
+    TermFrequencyRanker.name: TermFrequencyRanker,
+}
+
+
+def get_ranking_engine(name: str | None = None) -> RankingEngine:
+    engine_name = name or settings.ranking_engine
+    if engine_name not in RANKING_ENGINES:
+        raise ValueError(f"Unknown ranking engine: {engine_name}")
+    return RANKING_ENGINES[engine_name]()
@@ -0,0 +1,136 @@
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import Insert, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+from app.models import RationaleCacheEntry
+from app.utils.config import settings
+from app.utils.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+PRUNE_EVERY = 100
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def cache_key(model: str, template: str, requirement: str, evidence: list[str]) -> str:
+    digest = hashlib.sha256()
+    for part in (model, template, requirement):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    for text in evidence:
+        digest.update(hashlib.sha256(text.encode("utf-8")).digest())
+    return digest.hexdigest()
+
+
+def _upsert(db: Session, values: dict) -> None:
+    # Concurrent summaries of the same requirement and evidence write the same key; the last writer wins
+    dialect_insert = UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+    if dialect_insert is None:
+        db.merge(RationaleCacheEntry(**values))
+        return
+    statement: Insert = dialect_insert(RationaleCacheEntry).values(**values)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[RationaleCacheEntry.key],
+            set_={name: statement.excluded[name] for name in ("model", "rationale", "created_at", "last_used_at")},
+        )
+    )
+
+
+class RationaleCache:
+    def __init__(
+        self,
+        session_factory: sessionmaker = SessionLocal,
+        max_entries: int = settings.rationale_cache_max_entries,
+        max_age: timedelta = timedelta(days=settings.rationale_cache_max_age_days),
+    ) -> None:
+        self.session_factory = session_factory
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    # The cache is best-effort: a database error is logged and treated as a miss, never raised into a run
+    def get(self, key: str) -> str | None:
+        try:
+            with self.session_factory() as db:
+                entry = db.get(RationaleCacheEntry, key)
+                now = datetime.utcnow()
+                if entry is None or entry.created_at < now - self.max_age:
+                    self._count(hit=False)
+                    return None
+                entry.hit_count += 1
+                entry.last_used_at = now
+                rationale = entry.rationale
+                db.commit()
+        except SQLAlchemyError:
+            logger.warning("Rationale cache lookup failed", exc_info=True)
+            self._count(hit=False)
+            return None
+        self._count(hit=True)
+        return rationale
+
+    def put(self, key: str, model: str, rationale: str) -> None:
+        now = datetime.utcnow()
+        values = {"key": key, "model": model, "rationale": rationale, "created_at": now, "last_used_at": now}
+        try:
+            with self.session_factory() as db:
+                _upsert(db, values)
+                db.commit()
+        except SQLAlchemyError:
+            logger.warning("Rationale cache write failed", exc_info=True)
+            return
+        with self._lock:
+            self._puts += 1
+            should_prune = self._puts % PRUNE_EVERY == 0
+        if should_prune:
+            self.prune()
+
+    def prune(self) -> int:
+        try:
+            return self._prune()
+        except SQLAlchemyError:
+            logger.warning("Rationale cache prune failed", exc_info=True)
+            return 0
+
+    def _prune(self) -> int:
+        with self.session_factory() as db:
+            removed = db.execute(
+                delete(RationaleCacheEntry).where(RationaleCacheEntry.created_at < datetime.utcnow() - self.max_age)
+            ).rowcount
+            overflow = db.scalar(select(func.count()).select_from(RationaleCacheEntry)) - self.max_entries
+            if overflow > 0:
+                oldest = select(RationaleCacheEntry.key).order_by(RationaleCacheEntry.last_used_at).limit(overflow)
+                removed += db.execute(
+                    delete(RationaleCacheEntry).where(RationaleCacheEntry.key.in_(oldest)),
+                    execution_options={"synchronize_session": False},
+                ).rowcount
+            db.commit()
+        return removed
+
+    def stats(self) -> dict:
+        with self.session_factory() as db:
+            entries = db.scalar(select(func.count()).select_from(RationaleCacheEntry))
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+rationale_cache = RationaleCache()
@@ -1,40 +1,155 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from urllib.request import urlretrieve
+from urllib.parse import urlsplit
 from sqlalchemy.orm import Session
-from app.models import Document, DocumentChunk, RegulatorySource
-from app.services.document_service import extract_paragraphs
+from app.models import Document, RegulatorySource
+from app.services.fetch_service import FetchResult, fetch_to_file
+from app.services.ingestion_service import ingest_document
 from app.utils.config import settings
+from app.utils.database import SessionLocal
 
+logger = logging.getLogger(__name__)
 
-def ingest_regulatory_source(db: Session, source: RegulatorySource) -> Document:
+refresh_lock = threading.Lock()
+_destination_locks: dict[Path, threading.Lock] = {}
+_destination_locks_guard = threading.Lock()
+
+
+def _source_path(source: RegulatorySource) -> Path:
     storage_dir = Path(settings.storage_dir) / "regulatory" / source.category
     storage_dir.mkdir(parents=True, exist_ok=True)
-    file_name = source.url.split("/")[-1]
-    file_path = storage_dir / file_name
-    urlretrieve(source.url, file_path)
-
-    document = Document(
-        tenant_id=0,
-        source_type="regulatory",
-        title=source.name,
-        storage_path=str(file_path),
-    )
-    db.add(document)
-    db.flush()
-
-    file_type = file_path.suffix.replace(".", "")
-    for page_number, paragraph_index, content in extract_paragraphs(file_path, file_type):
-        db.add(
-            DocumentChunk(
-                document_id=document.id,
-                page_number=page_number,
-                paragraph_index=paragraph_index,
-                content=content,
-            )
-        )
+    return storage_dir / source.url.split("/")[-1]
+
+
+def destination_lock(path: Path) -> threading.Lock:
+    # Serializes fetch and ingest per file so the .part download and the Document row are never written twice at once
+    with _destination_locks_guard:
+        return _destination_locks.setdefault(path.resolve(), threading.Lock())
+
 
+def fetch_regulatory_source(source: RegulatorySource) -> FetchResult:
+    fetched = fetch_to_file(source.url, _source_path(source), source.etag, source.last_modified)
+    source.etag = fetched.etag
+    source.last_modified = fetched.last_modified
+    source.last_fetched_at = datetime.utcnow()
+    return fetched
+
+
+def ingest_fetched_source(db: Session, source: RegulatorySource, fetched: FetchResult) -> Document | None:
     source.last_ingested_at = datetime.utcnow()
+    if not fetched.changed:
+        # A 304 means the file on disk was already ingested when its validators were stored
+        db.commit()
+        return (
+            db.query(Document)
+            .filter(Document.tenant_id == 0, Document.storage_path == str(fetched.path))
+            .order_by(Document.id.desc())
+            .first()
+        )
+    result = ingest_document(db, 0, "regulatory", source.name, fetched.path, fetched.content_hash, fetched.size_bytes)
     db.commit()
-    db.refresh(document)
-    return document
+    db.refresh(result.document)
+    return result.document
+
+
+def ingest_regulatory_source(db: Session, source: RegulatorySource) -> Document | None:
+    with destination_lock(_source_path(source)):
+        return ingest_fetched_source(db, source, fetch_regulatory_source(source))
+
+
+def ingest_source_job(source_id: int) -> None:
+    db = SessionLocal()
+    try:
+        source = db.get(RegulatorySource, source_id)
+        if source is None:
+            return
+        ingest_regulatory_source(db, source)
+    except Exception:
+        logger.exception("Regulatory source %s ingest failed", source_id)
+        db.rollback()
+    finally:
+        db.close()
+
+
+def seed_sources(db: Session, sources_file: str | None = None) -> int:
+    path = Path(sources_file or settings.regulatory_sources_file)
+    if not path.exists():
+        return 0
+    known = {url for (url,) in db.query(RegulatorySource.url)}
+    added = 0
+    for entry in json.loads(path.read_text()):
+        if entry["url"] in known:
+            continue
+        db.add(RegulatorySource(name=entry["name"], url=entry["url"], category=entry["category"]))
+        known.add(entry["url"])
+        added += 1
+    db.commit()
+    return added
+
+
+def _refresh_source(source_id: int, host_limit: threading.Semaphore, deadline: float) -> str:
+    if time.monotonic() > deadline:
+        return "skipped"
+    db = SessionLocal()
+    try:
+        source = db.get(RegulatorySource, source_id)
+        with destination_lock(_source_path(source)):
+            with host_limit:
+                fetched = fetch_regulatory_source(source)
+            ingest_fetched_source(db, source, fetched)
+        return "changed" if fetched.changed else "unchanged"
+    except Exception:
+        logger.exception("Regulatory source %s refresh failed", source_id)
+        db.rollback()
+        return "failed"
+    finally:
+        db.close()
+
+
+def refresh_all_sources(
+    max_workers: int | None = None,
+    per_host_limit: int | None = None,
+    deadline_seconds: float | None = None,
+    seed: bool = True,
+) -> dict:
+    if not refresh_lock.acquire(blocking=False):
+        logger.info("Regulatory refresh already running, skipping")
+        return {"status": "already_running"}
+    try:
+        return _refresh_all_sources(max_workers, per_host_limit, deadline_seconds, seed)
+    finally:
+        refresh_lock.release()
+
+
+def _refresh_all_sources(
+    max_workers: int | None,
+    per_host_limit: int | None,
+    deadline_seconds: float | None,
+    seed: bool,
+) -> dict:
+    started = time.monotonic()
+    deadline = started + (deadline_seconds or settings.regulatory_refresh_deadline_seconds)
+    with SessionLocal() as db:
+        seeded = seed_sources(db) if seed else 0
+        sources = db.query(RegulatorySource.id, RegulatorySource.url).order_by(RegulatorySource.id).all()
+
+    limit = per_host_limit or settings.regulatory_per_host_limit
+    host_limits = {urlsplit(url).netloc: threading.Semaphore(limit) for _, url in sources}
+    with ThreadPoolExecutor(max_workers=max_workers or settings.regulatory_refresh_workers) as pool:
+        outcomes = list(
+            pool.map(
+                lambda source: _refresh_source(source[0], host_limits[urlsplit(source[1]).netloc], deadline),
+                sources,
+            )
+        )
+
+    summary = {outcome: outcomes.count(outcome) for outcome in ("changed", "unchanged", "failed", "skipped")}
+    summary["status"] = "completed"
+    summary.update({"total": len(sources), "seeded": seeded, "seconds": round(time.monotonic() - started, 2)})
+    logger.info("Regulatory refresh finished: %s", summary)
+    return summary
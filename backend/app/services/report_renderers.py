@@ -0,0 +1,268 @@
+import csv
+import json
+import re
+import textwrap
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+from xml.sax.saxutils import escape
+from zipfile import ZIP_DEFLATED, ZipFile
+
+
+@dataclass
+class Citation:
+    document_title: str
+    page_number: int | None
+    paragraph_index: int | None
+    confidence: str
+
+
+@dataclass
+class ReportSection:
+    requirement_id: str
+    status: str
+    rationale: str
+    citations: list[Citation] = field(default_factory=list)
+
+
+def format_citation(citation: Citation) -> str:
+    page_info = f"page {citation.page_number}" if citation.page_number else "page n/a"
+    paragraph_info = f"paragraph {citation.paragraph_index}" if citation.paragraph_index else "paragraph n/a"
+    return f"- {citation.document_title} ({page_info}, {paragraph_info}, confidence: {citation.confidence})"
+
+
+def section_lines(section: ReportSection) -> list[str]:
+    lines = [
+        f"Requirement: {section.requirement_id}",
+        f"Status: {section.status}",
+        "Rationale:",
+        section.rationale,
+        "Evidence:",
+    ]
+    if section.citations:
+        lines.extend(format_citation(citation) for citation in section.citations)
+    else:
+        lines.append("- No evidence found")
+    lines.append("")
+    return lines
+
+
+class ReportRenderer(ABC):
+    extension = ""
+    version = 1
+    media_type = "application/octet-stream"
+
+    @abstractmethod
+    def render(self, title: str, sections: Iterable[ReportSection], output_path: Path) -> None:
+        ...
+
+
+class _PdfWriter:
+    page_width = 612
+    page_height = 792
+    margin = 50
+    font_size = 10
+    leading = 13
+    wrap_width = 100
+
+    def __init__(self, handle: BinaryIO) -> None:
+        self.handle = handle
+        self.offsets: dict[int, int] = {}
+        self.page_ids: list[int] = []
+        self.next_id = 5
+        self.lines: list[tuple[bool, str]] = []
+        self.lines_per_page = (self.page_height - 2 * self.margin) // self.leading
+        self.position = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        self._object(4, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+
+    def _write(self, data: bytes) -> None:
+        self.handle.write(data)
+        self.position += len(data)
+
+    def _object(self, object_id: int, body: bytes) -> None:
+        self.offsets[object_id] = self.position
+        self._write(f"{object_id} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    def _allocate(self) -> int:
+        object_id = self.next_id
+        self.next_id += 1
+        return object_id
+
+    @staticmethod
+    def _escape(text: str) -> bytes:
+        encoded = text.encode("cp1252", errors="replace")
+        return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+    def add_line(self, text: str, bold: bool = False) -> None:
+        wrapped = textwrap.wrap(text, self.wrap_width, replace_whitespace=True) or [""]
+        for line in wrapped:
+            self.lines.append((bold, line))
+            if len(self.lines) >= self.lines_per_page:
+                self.flush_page()
+
+    def flush_page(self) -> None:
+        if not self.lines:
+            return
+        top = self.page_height - self.margin
+        parts = [f"BT {self.leading} TL {self.margin} {top} Td".encode()]
+        for bold, line in self.lines:
+            font = b"/F2" if bold else b"/F1"
+            parts.append(font + f" {self.font_size} Tf (".encode() + self._escape(line) + b") '")
+        parts.append(b"ET")
+        content = b"\n".join(parts)
+        content_id = self._allocate()
+        self._object(content_id, f"<< /Length {len(content)} >>\nstream\n".encode() + content + b"\nendstream")
+        page_id = self._allocate()
+        self._object(
+            page_id,
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.page_width} {self.page_height}] "
+                f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {content_id} 0 R >>"
+            ).encode(),
+        )
+        self.page_ids.append(page_id)
+        self.lines = []
+
+    def close(self) -> None:
+        self.flush_page()
+        if not self.page_ids:
+            self.add_line("")
+            self.flush_page()
+        kids = " ".join(f"{page_id} 0 R" for page_id in self.page_ids)
+        self._object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode())
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        xref_offset = self.position
+        size = self.next_id
+        entries = [b"0000000000 65535 f \n"]
+        entries.extend(f"{self.offsets[object_id]:010d} 00000 n \n".encode() for object_id in range(1, size))
+        self._write(f"xref\n0 {size}\n".encode() + b"".join(entries))
+        self._write(f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode())
+
+
+class PdfRenderer(ReportRenderer):
+    extension = "pdf"
+    media_type = "application/pdf"
+
+    def render(self, title: str, sections: Iterable[ReportSection], output_path: Path) -> None:
+        with output_path.open("wb") as handle:
+            writer = _PdfWriter(handle)
+            writer.add_line(title, bold=True)
+            writer.add_line("")
+            for section in sections:
+                for index, line in enumerate(section_lines(section)):
+                    writer.add_line(line, bold=index == 0)
+            writer.close()
+
+
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+_DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    "</Relationships>"
+)
+_DOCX_BODY_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+)
+_DOCX_BODY_END = "<w:sectPr/></w:body></w:document>"
+
+
+class DocxRenderer(ReportRenderer):
+    extension = "docx"
+    media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+    @staticmethod
+    def _paragraph(text: str, bold: bool = False, size: int | None = None) -> str:
+        properties = ("<w:b/>" if bold else "") + (f'<w:sz w:val="{size}"/>' if size else "")
+        if properties:
+            properties = f"<w:rPr>{properties}</w:rPr>"
+        content = escape(_INVALID_XML_CHARS.sub("", text))
+        return f'<w:p><w:r>{properties}<w:t xml:space="preserve">{content}</w:t></w:r></w:p>'
+
+    def render(self, title: str, sections: Iterable[ReportSection], output_path: Path) -> None:
+        with ZipFile(output_path, "w", ZIP_DEFLATED) as package:
+            package.writestr("[Content_Types].xml", _DOCX_CONTENT_TYPES)
+            package.writestr("_rels/.rels", _DOCX_RELS)
+            with package.open("word/document.xml", "w") as document:
+                document.write(_DOCX_BODY_START.encode("utf-8"))
+                document.write(self._paragraph(title, bold=True, size=32).encode("utf-8"))
+                for section in sections:
+                    parts = [
+                        self._paragraph(line, bold=index == 0) for index, line in enumerate(section_lines(section))
+                    ]
+                    document.write("".join(parts).encode("utf-8"))
+                document.write(_DOCX_BODY_END.encode("utf-8"))
+
+
+class CsvRenderer(ReportRenderer):
+    extension = "csv"
+    media_type = "text/csv"
+    columns = [
+        "requirement_id",
+        "status",
+        "rationale",
+        "document_title",
+        "page_number",
+        "paragraph_index",
+        "confidence",
+    ]
+
+    def render(self, title: str, sections: Iterable[ReportSection], output_path: Path) -> None:
+        with output_path.open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(self.columns)
+            for section in sections:
+                base = [section.requirement_id, section.status, section.rationale]
+                if not section.citations:
+                    writer.writerow(base + ["", "", "", ""])
+                for citation in section.citations:
+                    writer.writerow(
+                        base
+                        + [citation.document_title, citation.page_number, citation.paragraph_index, citation.confidence]
+                    )
+
+
+class JsonRenderer(ReportRenderer):
+    extension = "json"
+    media_type = "application/json"
+
+    def render(self, title: str, sections: Iterable[ReportSection], output_path: Path) -> None:
+        with output_path.open("w", encoding="utf-8") as handle:
+            handle.write('{"title": ' + json.dumps(title) + ', "results": [')
+            for index, section in enumerate(sections):
+                if index:
+                    handle.write(", ")
+                handle.write(json.dumps(asdict(section)))
+            handle.write("]}\n")
+
+
+RENDERERS: dict[str, type[ReportRenderer]] = {
+    PdfRenderer.extension: PdfRenderer,
+    DocxRenderer.extension: DocxRenderer,
+    CsvRenderer.extension: CsvRenderer,
+    JsonRenderer.extension: JsonRenderer,
+}
+
+
+def get_renderer(output_format: str) -> ReportRenderer:
+    key = output_format.lower()
+    if key not in RENDERERS:
+        raise ValueError(f"Unsupported report format: {output_format}")
+    return RENDERERS[key]()
@@ -1,49 +1,142 @@
+import hashlib
+import json
+import os
+import uuid
+from collections.abc import Iterator
+from itertools import groupby
 from pathlib import Path
+from sqlalchemy import Select, and_, func, select
 from sqlalchemy.orm import Session
-from app.models import ComplianceResult, Document, DocumentChunk, Evidence, Report
+from app.models import ComplianceResult, ComplianceRun, Document, DocumentChunk, Evidence, Report
+from app.services.report_renderers import Citation, ReportRenderer, ReportSection, get_renderer, section_lines
 from app.utils.config import settings
 
 
-def _format_citation(document: Document, chunk: DocumentChunk, confidence: str) -> str:
-    page_info = f"page {chunk.page_number}" if chunk.page_number else "page n/a"
-    paragraph_info = f"paragraph {chunk.paragraph_index}" if chunk.paragraph_index else "paragraph n/a"
-    return f"- {document.title} ({page_info}, {paragraph_info}, confidence: {confidence})"
+def report_rows_query(run_id: int) -> Select:
+    return (
+        select(
+            ComplianceResult.id,
+            ComplianceResult.requirement_id,
+            ComplianceResult.status,
+            ComplianceResult.rationale,
+            Evidence.id.label("evidence_id"),
+            Evidence.confidence,
+            DocumentChunk.page_number,
+            DocumentChunk.paragraph_index,
+            Document.title,
+        )
+        .outerjoin(
+            Evidence,
+            and_(Evidence.run_id == ComplianceResult.run_id, Evidence.requirement_id == ComplianceResult.requirement_id),
+        )
+        .outerjoin(DocumentChunk, Evidence.chunk_id == DocumentChunk.id)
+        .outerjoin(Document, Evidence.document_id == Document.id)
+        .where(ComplianceResult.run_id == run_id)
+        .order_by(ComplianceResult.id, Evidence.id)
+    )
+
+
+def iter_report_sections(db: Session, run_id: int) -> Iterator[ReportSection]:
+    rows = db.execute(report_rows_query(run_id).execution_options(yield_per=settings.report_fetch_size))
+    for _, group in groupby(rows, key=lambda row: row.id):
+        first, *rest = group
+        citations = [
+            Citation(
+                document_title=row.title,
+                page_number=row.page_number,
+                paragraph_index=row.paragraph_index,
+                confidence=row.confidence,
+            )
+            for row in (first, *rest)
+            if row.evidence_id is not None
+        ]
+        yield ReportSection(
+            requirement_id=first.requirement_id,
+            status=first.status,
+            rationale=first.rationale,
+            citations=citations,
+        )
 
 
 def build_report_content(db: Session, run_id: int) -> str:
-    results = db.query(ComplianceResult).filter(ComplianceResult.run_id == run_id).all()
     lines = ["Compliance Report", "================="]
-    for result in results:
-        lines.append(f"Requirement: {result.requirement_id}")
-        lines.append(f"Status: {result.status}")
-        lines.append("Rationale:")
-        lines.append(result.rationale)
-        lines.append("Evidence:")
-        evidence_rows = (
-            db.query(Evidence, DocumentChunk, Document)
-            .join(DocumentChunk, Evidence.chunk_id == DocumentChunk.id)
-            .join(Document, Evidence.document_id == Document.id)
-            .filter(Evidence.requirement_id == result.requirement_id)
-            .all()
-        )
-        if evidence_rows:
-            for evidence, chunk, document in evidence_rows:
-                lines.append(_format_citation(document, chunk, evidence.confidence))
-        else:
-            lines.append("- No evidence found")
-        lines.append("")
+    for section in iter_report_sections(db, run_id):
+        lines.extend(section_lines(section))
     return "\n".join(lines)
 
 
+def report_cache_key(db: Session, run_id: int, title: str, renderer: ReportRenderer) -> str:
+    # Results and evidence are append-only and cited chunks never change, so counts and max ids pin the content
+    run_status = db.scalar(select(ComplianceRun.status).where(ComplianceRun.id == run_id))
+    result_count, max_result_id = db.execute(
+        select(func.count(ComplianceResult.id), func.max(ComplianceResult.id)).where(ComplianceResult.run_id == run_id)
+    ).one()
+    evidence_count, max_evidence_id = db.execute(
+        select(func.count(Evidence.id), func.max(Evidence.id)).where(Evidence.run_id == run_id)
+    ).one()
+    key = [
+        title,
+        renderer.extension,
+        renderer.version,
+        run_status,
+        result_count,
+        max_result_id,
+        evidence_count,
+        max_evidence_id,
+    ]
+    return hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+
+
+def delete_superseded_reports(db: Session, report: Report) -> int:
+    # The title is part of the cache key, so only earlier renders of the same title are stale
+    superseded = (
+        db.query(Report)
+        .filter(
+            Report.run_id == report.run_id,
+            Report.format == report.format,
+            Report.title == report.title,
+            Report.id != report.id,
+        )
+        .all()
+    )
+    for old in superseded:
+        if old.output_path != report.output_path:
+            Path(old.output_path).unlink(missing_ok=True)
+        db.delete(old)
+    return len(superseded)
+
+
 def generate_report(db: Session, run_id: int, title: str, output_format: str) -> Report:
+    renderer = get_renderer(output_format)
+    content_hash = report_cache_key(db, run_id, title, renderer)
+    cached = (
+        db.query(Report)
+        .filter(Report.run_id == run_id, Report.format == renderer.extension, Report.content_hash == content_hash)
+        .order_by(Report.id.desc())
+        .first()
+    )
+    if cached and Path(cached.output_path).exists():
+        return cached
+
     output_dir = Path(settings.storage_dir) / "reports"
     output_dir.mkdir(parents=True, exist_ok=True)
-    extension = "pdf" if output_format.lower() == "pdf" else "docx"
-    output_path = output_dir / f"{title.replace(' ', '_')}.{extension}"
-    content = build_report_content(db, run_id)
-    output_path.write_text(content, encoding="utf-8")
-    report = Report(run_id=run_id, title=title, output_path=str(output_path))
+    output_path = output_dir / f"run-{run_id}-{content_hash[:16]}.{renderer.extension}"
+    partial_path = output_path.with_name(f"{output_path.name}.{uuid.uuid4().hex}.part")
+    try:
+        renderer.render(title, iter_report_sections(db, run_id), partial_path)
+        os.replace(partial_path, output_path)
+    finally:
+        partial_path.unlink(missing_ok=True)
+    report = Report(
+        run_id=run_id,
+        title=title,
+        format=renderer.extension,
+        content_hash=content_hash,
+        output_path=str(output_path),
+    )
     db.add(report)
+    db.flush()
+    delete_superseded_reports(db, report)
     db.commit()
     db.refresh(report)
     return report
@@ -0,0 +1,108 @@
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+from app.services.openai_client import OpenAIClient, estimate_tokens
+from app.utils.config import settings
+
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+WINDOW_SECONDS = 60.0
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.clock = clock
+        self.sleep = sleep
+        self._events: deque[tuple[float, int]] = deque()
+        self._tokens_in_window = 0
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        while self._events and self._events[0][0] <= now - WINDOW_SECONDS:
+            _, tokens = self._events.popleft()
+            self._tokens_in_window -= tokens
+
+    def _has_capacity(self, tokens: int) -> bool:
+        if not self._events:
+            return True
+        if self.requests_per_minute > 0 and len(self._events) >= self.requests_per_minute:
+            return False
+        if self.tokens_per_minute > 0 and self._tokens_in_window + tokens > self.tokens_per_minute:
+            return False
+        return True
+
+    def acquire(self, tokens: int) -> None:
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._expire(now)
+                if self._has_capacity(tokens):
+                    self._events.append((now, tokens))
+                    self._tokens_in_window += tokens
+                    return
+                wait = self._events[0][0] + WINDOW_SECONDS - now
+            self.sleep(max(wait, 0.01))
+
+
+rate_limiter = RateLimiter(settings.openai_requests_per_minute, settings.openai_tokens_per_minute)
+
+
+def _summarize_with_backoff(
+    client: OpenAIClient,
+    limiter: RateLimiter,
+    requirement: str,
+    evidence: list[str],
+    max_retries: int,
+) -> str:
+    cached = client.cached_summary(requirement, evidence)
+    if cached is not None:
+        return cached
+    tokens = estimate_tokens(client.build_prompt(requirement, evidence))
+    for attempt in range(max_retries + 1):
+        limiter.acquire(tokens)
+        try:
+            return client.summarize_with_evidence(requirement, evidence, check_cache=False)
+        except RETRYABLE_ERRORS:
+            if attempt == max_retries:
+                raise
+            limiter.sleep(min(60.0, 2**attempt) + random.uniform(0, 1))
+    raise RuntimeError("unreachable")
+
+
+def summarize_requirements(
+    client: OpenAIClient,
+    items: list[tuple[str, list[str]]],
+    max_workers: int | None = None,
+    limiter: RateLimiter | None = None,
+    max_retries: int | None = None,
+) -> Iterator[str]:
+    if client.disabled:
+        for requirement, evidence in items:
+            yield client.summarize_with_evidence(requirement, evidence)
+        return
+
+    limiter = limiter or rate_limiter
+    retries = settings.openai_max_retries if max_retries is None else max_retries
+    workers = max(1, max_workers or settings.openai_max_concurrency)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summarize") as executor:
+        futures = [
+            executor.submit(_summarize_with_backoff, client, limiter, requirement, evidence, retries)
+            for requirement, evidence in items
+        ]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,146 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 06:44:29.271316
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('regulatory_sources',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('url', sa.String(length=1000), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=False),
+    sa.Column('last_ingested_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_regulatory_sources_id', 'regulatory_sources', ['id'])
+    op.create_table('tenants',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_index('ix_tenants_id', 'tenants', ['id'])
+    op.create_table('compliance_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tenant_id', sa.Integer(), nullable=False),
+    sa.Column('report_type', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_compliance_runs_id', 'compliance_runs', ['id'])
+    op.create_table('documents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tenant_id', sa.Integer(), nullable=False),
+    sa.Column('source_type', sa.String(length=50), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('storage_path', sa.String(length=500), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_documents_id', 'documents', ['id'])
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.String(length=50), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('tenant_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_table('audit_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tenant_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(length=255), nullable=False),
+    sa.Column('details', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_audit_logs_id', 'audit_logs', ['id'])
+    op.create_table('compliance_results',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('run_id', sa.Integer(), nullable=False),
+    sa.Column('requirement_id', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('rationale', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['run_id'], ['compliance_runs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_compliance_results_id', 'compliance_results', ['id'])
+    op.create_table('document_chunks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('document_id', sa.Integer(), nullable=False),
+    sa.Column('page_number', sa.Integer(), nullable=True),
+    sa.Column('paragraph_index', sa.Integer(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_document_chunks_id', 'document_chunks', ['id'])
+    op.create_table('reports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('run_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('output_path', sa.String(length=500), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['run_id'], ['compliance_runs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_reports_id', 'reports', ['id'])
+    op.create_table('evidence',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('requirement_id', sa.String(length=255), nullable=False),
+    sa.Column('document_id', sa.Integer(), nullable=False),
+    sa.Column('chunk_id', sa.Integer(), nullable=False),
+    sa.Column('confidence', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['chunk_id'], ['document_chunks.id'], ),
+    sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_evidence_id', 'evidence', ['id'])
+
+
+
+def downgrade() -> None:
+    op.drop_index('ix_evidence_id', table_name='evidence')
+    op.drop_table('evidence')
+    op.drop_index('ix_reports_id', table_name='reports')
+    op.drop_table('reports')
+    op.drop_index('ix_document_chunks_id', table_name='document_chunks')
+    op.drop_table('document_chunks')
+    op.drop_index('ix_compliance_results_id', table_name='compliance_results')
+    op.drop_table('compliance_results')
+    op.drop_index('ix_audit_logs_id', table_name='audit_logs')
+    op.drop_table('audit_logs')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
+    op.drop_index('ix_documents_id', table_name='documents')
+    op.drop_table('documents')
+    op.drop_index('ix_compliance_runs_id', table_name='compliance_runs')
+    op.drop_table('compliance_runs')
+    op.drop_index('ix_tenants_id', table_name='tenants')
+    op.drop_table('tenants')
+    op.drop_index('ix_regulatory_sources_id', table_name='regulatory_sources')
+    op.drop_table('regulatory_sources')
@@ -0,0 +1,152 @@
+"""indexing, caching and run tracking schema
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 06:44:46.317108
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# The baseline create_all() left foreign keys unnamed; SQLite batch mode needs a naming convention
+# to find them, while Postgres already named them <table>_<column>_fkey.
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+# (table, column, referred table, referred column, ondelete before, ondelete after)
+FOREIGN_KEYS = [
+    ('audit_logs', 'user_id', 'users', 'id', None, 'SET NULL'),
+    ('compliance_results', 'run_id', 'compliance_runs', 'id', None, 'CASCADE'),
+    ('document_chunks', 'document_id', 'documents', 'id', None, 'CASCADE'),
+    ('evidence', 'chunk_id', 'document_chunks', 'id', None, 'CASCADE'),
+    ('evidence', 'document_id', 'documents', 'id', None, 'CASCADE'),
+    ('reports', 'run_id', 'compliance_runs', 'id', None, 'CASCADE'),
+]
+
+
+def fk_name(table: str, column: str, referred: str) -> str:
+    if op.get_bind().dialect.name == 'sqlite':
+        return f'fk_{table}_{column}_{referred}'
+    return f'{table}_{column}_fkey'
+
+
+def batch(table: str):
+    return op.batch_alter_table(table, naming_convention=NAMING_CONVENTION)
+
+
+def replace_foreign_keys(downgrade: bool = False) -> None:
+    for table, column, referred, referred_column, before, after in FOREIGN_KEYS:
+        name = fk_name(table, column, referred)
+        with batch(table) as batch_op:
+            batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.create_foreign_key(
+                name, referred, [column], [referred_column], ondelete=before if downgrade else after
+            )
+
+
+def upgrade() -> None:
+    op.create_table('rationale_cache',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('rationale', sa.Text(), nullable=False),
+    sa.Column('hit_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index('ix_rationale_cache_created_at', 'rationale_cache', ['created_at'])
+    op.create_index('ix_rationale_cache_last_used_at', 'rationale_cache', ['last_used_at'])
+    op.create_table('chunk_terms',
+    sa.Column('term', sa.String(length=100), nullable=False),
+    sa.Column('chunk_id', sa.Integer(), nullable=False),
+    sa.Column('tf', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['chunk_id'], ['document_chunks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('term', 'chunk_id')
+    )
+    op.create_index('ix_chunk_terms_chunk_id', 'chunk_terms', ['chunk_id'])
+
+    # Existing rows get server defaults so the NOT NULL columns can be added to populated tables
+    with batch('compliance_runs') as batch_op:
+        batch_op.add_column(sa.Column('requirement_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('error', sa.Text(), nullable=True))
+    with batch('document_chunks') as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('token_count', sa.Integer(), nullable=False, server_default='0'))
+    with batch('documents') as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('size_bytes', sa.BigInteger(), nullable=True))
+    with batch('evidence') as batch_op:
+        batch_op.add_column(sa.Column('run_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            fk_name('evidence', 'run_id', 'compliance_runs'), 'compliance_runs', ['run_id'], ['id'], ondelete='CASCADE'
+        )
+    with batch('regulatory_sources') as batch_op:
+        batch_op.add_column(sa.Column('etag', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('last_modified', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('last_fetched_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(
+            sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.current_timestamp())
+        )
+    with batch('reports') as batch_op:
+        batch_op.add_column(sa.Column('format', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+    replace_foreign_keys()
+
+    op.create_index('ix_audit_logs_tenant_created', 'audit_logs', ['tenant_id', 'created_at', 'id'])
+    op.create_index('ix_compliance_results_run_id', 'compliance_results', ['run_id'])
+    op.create_index('ix_compliance_runs_tenant_id', 'compliance_runs', ['tenant_id'])
+    op.create_index('ix_document_chunks_document_id', 'document_chunks', ['document_id'])
+    op.create_index('ix_documents_tenant_created', 'documents', ['tenant_id', 'created_at', 'id'])
+    op.create_index('ix_evidence_chunk_id', 'evidence', ['chunk_id'])
+    op.create_index('ix_evidence_document_id', 'evidence', ['document_id'])
+    op.create_index('ix_evidence_requirement_id', 'evidence', ['requirement_id'])
+    op.create_index('ix_evidence_run_requirement', 'evidence', ['run_id', 'requirement_id'])
+    op.create_index('ix_regulatory_sources_created', 'regulatory_sources', ['created_at', 'id'])
+    op.create_index('ix_reports_run_format', 'reports', ['run_id', 'format'])
+    op.create_index('ix_users_tenant_id', 'users', ['tenant_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_tenant_id', table_name='users')
+    op.drop_index('ix_reports_run_format', table_name='reports')
+    op.drop_index('ix_regulatory_sources_created', table_name='regulatory_sources')
+    op.drop_index('ix_evidence_run_requirement', table_name='evidence')
+    op.drop_index('ix_evidence_requirement_id', table_name='evidence')
+    op.drop_index('ix_evidence_document_id', table_name='evidence')
+    op.drop_index('ix_evidence_chunk_id', table_name='evidence')
+    op.drop_index('ix_documents_tenant_created', table_name='documents')
+    op.drop_index('ix_document_chunks_document_id', table_name='document_chunks')
+    op.drop_index('ix_compliance_runs_tenant_id', table_name='compliance_runs')
+    op.drop_index('ix_compliance_results_run_id', table_name='compliance_results')
+    op.drop_index('ix_audit_logs_tenant_created', table_name='audit_logs')
+
+    replace_foreign_keys(downgrade=True)
+    with batch('reports') as batch_op:
+        batch_op.drop_column('content_hash')
+        batch_op.drop_column('format')
+    with batch('regulatory_sources') as batch_op:
+        batch_op.drop_column('created_at')
+        batch_op.drop_column('last_fetched_at')
+        batch_op.drop_column('last_modified')
+        batch_op.drop_column('etag')
+    with batch('evidence') as batch_op:
+        batch_op.drop_constraint(fk_name('evidence', 'run_id', 'compliance_runs'), type_='foreignkey')
+        batch_op.drop_column('run_id')
+    with batch('documents') as batch_op:
+        batch_op.drop_column('size_bytes')
+        batch_op.drop_column('content_hash')
+    with batch('document_chunks') as batch_op:
+        batch_op.drop_column('token_count')
+        batch_op.drop_column('content_hash')
+    with batch('compliance_runs') as batch_op:
+        batch_op.drop_column('error')
+        batch_op.drop_column('requirement_count')
+
+    op.drop_index('ix_chunk_terms_chunk_id', table_name='chunk_terms')
+    op.drop_table('chunk_terms')
+    op.drop_index('ix_rationale_cache_last_used_at', table_name='rationale_cache')
+    op.drop_index('ix_rationale_cache_created_at', table_name='rationale_cache')
+    op.drop_table('rationale_cache')
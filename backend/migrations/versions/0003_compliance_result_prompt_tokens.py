@@ -0,0 +1,22 @@
+"""compliance result prompt tokens
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 06:37:26.719576
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('compliance_results', sa.Column('prompt_tokens', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('compliance_results', schema=None) as batch_op:
+        batch_op.drop_column('prompt_tokens')
@@ -0,0 +1,22 @@
+"""retire cited document chunks
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 06:48:06.920121
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('document_chunks', sa.Column('retired_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('document_chunks', schema=None) as batch_op:
+        batch_op.drop_column('retired_at')
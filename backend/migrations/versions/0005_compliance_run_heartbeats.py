@@ -0,0 +1,24 @@
+"""compliance run heartbeats
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 06:59:25.957662
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('compliance_runs', sa.Column('worker_id', sa.String(length=255), nullable=True))
+    op.add_column('compliance_runs', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('compliance_runs', schema=None) as batch_op:
+        batch_op.drop_column('heartbeat_at')
+        batch_op.drop_column('worker_id')
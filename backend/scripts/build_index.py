@@ -0,0 +1,15 @@
+from app.services.index_service import rebuild_index
+from app.utils.database import SessionLocal
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        postings = rebuild_index(db)
+        print(f"Indexed {postings} postings")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
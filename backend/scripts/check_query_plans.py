@@ -0,0 +1,69 @@
+import json
+import re
+import sys
+from sqlalchemy import Select, select, text
+from sqlalchemy.engine import Connection
+from app.models import AuditLog, DocumentChunk, Evidence
+from app.services.index_service import corpus_stats_query, postings_query
+from app.services.report_service import report_rows_query
+from app.utils.database import engine
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def hot_queries() -> dict[str, Select]:
+    return {
+        "retrieval postings": postings_query(["capital", "liabilities"], tenant_id=1, source_types=["internal"]),
+        "slice stats": corpus_stats_query(tenant_id=1, source_types=["internal"]),
+        "report rows": report_rows_query(1),
+        "chunks by document": select(DocumentChunk.id, DocumentChunk.content_hash).where(
+            DocumentChunk.document_id == 1, DocumentChunk.retired_at.is_(None)
+        ),
+        "evidence by chunk": select(Evidence.id).where(Evidence.chunk_id.in_([1, 2, 3])),
+        "audit page": (
+            select(AuditLog.id)
+            .where(AuditLog.tenant_id == 1)
+            .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+            .limit(50)
+        ),
+    }
+
+
+def _compile(connection: Connection, query: Select) -> str:
+    return str(query.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def sqlite_full_scans(connection: Connection, query: Select) -> list[str]:
+    plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {_compile(connection, query)}").all()
+    return [row[3] for row in plan if FULL_SCAN.match(row[3])]
+
+
+def _seq_scans(node: dict) -> list[str]:
+    scans = [node["Relation Name"]] if node["Node Type"] == "Seq Scan" else []
+    for child in node.get("Plans", []):
+        scans.extend(_seq_scans(child))
+    return scans
+
+
+def postgres_full_scans(connection: Connection, query: Select) -> list[str]:
+    connection.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {_compile(connection, query)}").scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return [f"Seq Scan on {relation}" for relation in _seq_scans(plan[0]["Plan"])]
+
+
+def main() -> int:
+    check = postgres_full_scans if engine.dialect.name == "postgresql" else sqlite_full_scans
+    failures = 0
+    with engine.connect() as connection:
+        for name, query in hot_queries().items():
+            with connection.begin():
+                scans = check(connection, query)
+            print(f"{'FAIL' if scans else 'ok'}: {name}{' (' + ', '.join(scans) + ')' if scans else ''}")
+            failures += bool(scans)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
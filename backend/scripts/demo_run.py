@@ -2,11 +2,13 @@ import json
 import os
 from pathlib import Path
 from docx import Document as DocxDocument
-from app.models import ComplianceRun, Document, DocumentChunk, Tenant
+from app.models import ComplianceRun, Document, Tenant
 from app.services.compliance_service import evaluate_requirements
 from app.services.document_service import extract_paragraphs
+from app.services.ingestion_service import write_document_chunks
 from app.services.report_service import generate_report
-from app.utils.database import Base, SessionLocal, engine
+from app.utils.database import SessionLocal
+from scripts.init_db import main as init_db
 
 
 def seed_docx(path: Path) -> None:
@@ -26,7 +28,7 @@ def main() -> None:
     sample_doc = storage_dir / "ffiec051-sample.docx"
     seed_docx(sample_doc)
 
-    Base.metadata.create_all(bind=engine)
+    init_db()
     db = SessionLocal()
 
     tenant = Tenant(name="Demo Bank")
@@ -43,15 +45,7 @@ def main() -> None:
     db.add(document)
     db.flush()
 
-    for page_number, paragraph_index, content in extract_paragraphs(sample_doc, "docx"):
-        db.add(
-            DocumentChunk(
-                document_id=document.id,
-                page_number=page_number,
-                paragraph_index=paragraph_index,
-                content=content,
-            )
-        )
+    write_document_chunks(db, document.id, extract_paragraphs(sample_doc, "docx"))
     db.commit()
 
     requirements_path = Path("/workspace/Projecthub/backend/sample_data/ffiec051_requirements.json")
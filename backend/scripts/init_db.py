@@ -1,9 +1,18 @@
-from app.utils.database import Base, engine
-import app.models  # noqa: F401
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def alembic_config() -> Config:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    return config
 
 
 def main() -> None:
-    Base.metadata.create_all(bind=engine)
+    command.upgrade(alembic_config(), "head")
 
 
 if __name__ == "__main__":
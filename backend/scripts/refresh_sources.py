@@ -0,0 +1,12 @@
+import logging
+from app.services.regulatory_service import refresh_all_sources
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    summary = refresh_all_sources()
+    print(f"Refreshed regulatory sources: {summary}")
+
+
+if __name__ == "__main__":
+    main()
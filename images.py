@@ -0,0 +1,79 @@
+import hashlib
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+from models import db, Project
+from render_cache import render_cache, project_namespace
+
+# Bounding boxes for the resized copies written next to each upload
+VARIANTS = {
+    'thumbnail': (320, 240),
+    'listing': (800, 600),
+}
+JPEG_QUALITY = 82
+
+executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='image-variants')
+
+
+def file_digest(path, block_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def flatten(image):
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def write_variants(source_path, folder):
+    os.makedirs(folder, exist_ok=True)
+    digest = file_digest(source_path)[:16]
+    names = {variant: f'{digest}-{variant}.jpg' for variant in VARIANTS}
+    # Names are derived from the original's bytes, so existing files are already correct
+    if all(os.path.exists(os.path.join(folder, name)) for name in names.values()):
+        return names
+
+    with Image.open(source_path) as original:
+        image = flatten(ImageOps.exif_transpose(original))
+    for variant, size in VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail(size, Image.LANCZOS)
+        destination = os.path.join(folder, names[variant])
+        partial = f'{destination}.{uuid.uuid4().hex}.part'
+        resized.save(partial, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+        os.replace(partial, destination)
+    return names
+
+
+def process_project_image(app, project_id):
+    with app.app_context():
+        try:
+            project = db.session.get(Project, project_id)
+            if project is None:
+                return
+            source_path = os.path.join(app.config['UPLOAD_FOLDER'], project.image)
+            names = write_variants(source_path, app.config['VARIANT_FOLDER'])
+            project.thumbnail_image = names['thumbnail']
+            project.listing_image = names['listing']
+            db.session.commit()
+            render_cache.invalidate('browse', project_namespace(project_id))
+        except Exception as e:
+            db.session.rollback()
+            print(f"Could not build image variants for project {project_id}: {e}")
+        finally:
+            db.session.remove()
+
+
+def submit_project_image(app, project_id):
+    # Resizing runs off the request thread; pages fall back to the original until it finishes
+    return executor.submit(process_project_image, app, project_id)
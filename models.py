@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import relationship
 
@@ -30,6 +32,10 @@ class Project(db.Model):
     place = db.Column(db.String(100), nullable=False)
     date = db.Column(db.String(50), nullable=False)
     image = db.Column(db.String(255), nullable=False)
+    thumbnail_image = db.Column(db.String(255), nullable=True)
+    listing_image = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     def __repr__(self):
         return f'<Project {self.id}: {self.title} organized by {self.organizer_id}>'
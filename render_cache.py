@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class MemoryBackend:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+class FileBackend:
+    # Shared by every worker process on the host; writes go through os.replace so readers never see partial files
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name):
+        # The kind prefix ('entry' or 'generation') lets prune tell entries from generation tokens
+        kind = name.split(':', 1)[0]
+        digest = hashlib.sha256(name.encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.directory, f'{kind}-{digest}.json')
+
+    def _read(self, name):
+        try:
+            with open(self._path(name), encoding='utf-8') as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, name, value):
+        path = self._path(name)
+        partial = f'{path}.{uuid.uuid4().hex}.part'
+        with open(partial, 'w', encoding='utf-8') as handle:
+            json.dump(value, handle)
+        os.replace(partial, path)
+
+    def get(self, key):
+        return self._read(f'entry:{key}')
+
+    def set(self, key, entry):
+        self._write(f'entry:{key}', entry)
+
+    def get_generation(self, namespace):
+        return self._read(f'generation:{namespace}')
+
+    def set_generation(self, namespace, generation):
+        self._write(f'generation:{namespace}', generation)
+
+    def prune(self, max_age):
+        # Only entries (and their abandoned partial writes) expire; generation tokens are never removed
+        cutoff = time.time() - max_age
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                if name.startswith('entry-') and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+# Rendered pages for anonymous visitors, grouped into namespaces that writers invalidate.
+# Invalidation swaps the namespace's generation token instead of deleting keys, so with a
+# shared backend it also invalidates every worker's in-process copies.
+class RenderCache:
+
+    def __init__(self, max_entries=512, ttl=300, directory=None):
+        self.ttl = ttl
+        self.memory = MemoryBackend(max_entries)
+        self.shared = FileBackend(directory) if directory else None
+        self.generations = {}
+        self.lock = threading.Lock()
+        self.pruner = None
+
+    def _start_pruner(self):
+        # Started on first write rather than at import so forked workers each get their own thread
+        with self.lock:
+            if self.pruner is not None:
+                return
+            self.pruner = threading.Thread(target=self._prune_loop, name='render-cache-prune', daemon=True)
+            self.pruner.start()
+
+    def _prune_loop(self):
+        while True:
+            time.sleep(max(self.ttl, 1))
+            self.shared.prune(self.ttl)
+
+    def _generation(self, namespace):
+        if self.shared is not None:
+            generation = self.shared.get_generation(namespace)
+            if generation is None:
+                generation = uuid.uuid4().hex
+                self.shared.set_generation(namespace, generation)
+            return generation
+        with self.lock:
+            return self.generations.setdefault(namespace, uuid.uuid4().hex)
+
+    def key(self, namespace, name):
+        # Take the key before reading the database and pass it to set(), so a page rendered from data read
+        # before an invalidation is stored under the old generation and never served
+        return f'{namespace}:{self._generation(namespace)}:{name}'
+
+    def get(self, key):
+        entry = self.memory.get(key)
+        if entry is None and self.shared is not None:
+            entry = self.shared.get(key)
+            if entry is not None:
+                self.memory.set(key, entry)
+        # The TTL bounds staleness from writes that bypass the request handlers
+        if entry is None or time.time() - entry['stored_at'] > self.ttl:
+            return None
+        return entry
+
+    def set(self, key, html, etag, last_modified=None, links=None):
+        entry = {
+            'html': html,
+            'etag': etag,
+            'last_modified': last_modified.timestamp() if last_modified else None,
+            'links': links,
+            'stored_at': time.time(),
+        }
+        self.memory.set(key, entry)
+        if self.shared is not None:
+            self.shared.set(key, entry)
+            self._start_pruner()
+
+    def invalidate(self, *namespaces):
+        generation = None
+        for namespace in namespaces:
+            generation = uuid.uuid4().hex
+            if self.shared is not None:
+                self.shared.set_generation(namespace, generation)
+            else:
+                with self.lock:
+                    self.generations[namespace] = generation
+        return generation
+
+
+def project_namespace(project_id):
+    return f'project-{project_id}'
+
+
+render_cache = RenderCache(
+    max_entries=int(os.environ.get('RENDER_CACHE_SIZE', '512')),
+    ttl=int(os.environ.get('RENDER_CACHE_TTL', '300')),
+    directory=os.environ.get('RENDER_CACHE_DIR') or None,
+)
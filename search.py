@@ -0,0 +1,88 @@
+import re
+
+from sqlalchemy import text
+
+from models import db
+
+SEARCH_COLUMNS = ('title', 'description', 'place', 'eligibility')
+# bm25() weights per column, in SEARCH_COLUMNS order; a title hit outranks a description hit
+COLUMN_WEIGHTS = (10.0, 1.0, 3.0, 2.0)
+QUERY_TERM = re.compile(r'"([^"]*)"|(\S+)')
+MAX_QUERY_TERMS = 16
+
+_columns = ', '.join(SEARCH_COLUMNS)
+_new_values = ', '.join(f'new.{column}' for column in SEARCH_COLUMNS)
+_old_values = ', '.join(f'old.{column}' for column in SEARCH_COLUMNS)
+
+# External-content FTS5 table: the text lives in project, the index in project_fts
+SEARCH_SCHEMA = (
+    f"""CREATE VIRTUAL TABLE project_fts USING fts5(
+        {_columns}, content='project', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS project_fts_insert AFTER INSERT ON project BEGIN
+        INSERT INTO project_fts(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS project_fts_delete AFTER DELETE ON project BEGIN
+        INSERT INTO project_fts(project_fts, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS project_fts_update AFTER UPDATE OF {_columns} ON project BEGIN
+        INSERT INTO project_fts(project_fts, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+        INSERT INTO project_fts(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END""",
+)
+
+
+def create_search_index():
+    exists = db.session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'project_fts'")
+    ).first()
+    if not exists:
+        db.session.execute(text(SEARCH_SCHEMA[0]))
+        # Index projects that were created before the table existed
+        db.session.execute(text("INSERT INTO project_fts(project_fts) VALUES ('rebuild')"))
+    for statement in SEARCH_SCHEMA[1:]:
+        db.session.execute(text(statement))
+    db.session.commit()
+
+
+def match_expression(query):
+    # Every term becomes a quoted FTS5 string, so user input can never be read as query syntax
+    terms = []
+    for phrase, word in QUERY_TERM.findall(query):
+        term = (phrase or word).strip()
+        if term:
+            terms.append('"' + term.replace('"', '""') + '"')
+    return ' '.join(terms[:MAX_QUERY_TERMS])
+
+
+def search_project_ids(query, min_fee=None, max_fee=None, date_from=None, date_to=None, limit=20, offset=0):
+    expression = match_expression(query)
+    if not expression:
+        return []
+
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+    filters = []
+    params = {'expression': expression, 'limit': limit, 'offset': offset}
+    if min_fee is not None:
+        filters.append('project.fee >= :min_fee')
+        params['min_fee'] = min_fee
+    if max_fee is not None:
+        filters.append('project.fee <= :max_fee')
+        params['max_fee'] = max_fee
+    # Dates are stored as ISO strings from the upload form, so string comparison orders them correctly
+    if date_from:
+        filters.append('project.date >= :date_from')
+        params['date_from'] = date_from
+    if date_to:
+        filters.append('project.date <= :date_to')
+        params['date_to'] = date_to
+
+    sql = f"""
+        SELECT project.id
+        FROM project_fts
+        JOIN project ON project.id = project_fts.rowid
+        WHERE project_fts MATCH :expression {''.join(f' AND {condition}' for condition in filters)}
+        ORDER BY bm25(project_fts, {weights}), project.id DESC
+        LIMIT :limit OFFSET :offset
+    """
+    return [row[0] for row in db.session.execute(text(sql), params)]